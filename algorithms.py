@@ -2,37 +2,147 @@
 File: algorithms.py
 
 This module contains methods that implement depth-first traversal, the 
-topological sort, minimum spanning tree and single-source shortest paths 
-graph processing algorithms. Also includes methods for working with
-infinity.
+topological sort, minimum spanning tree, single-source and all-pairs
+shortest paths graph processing algorithms. Also includes methods for 
+working with infinity.
+
+The algorithms accept a LinkedDirectedGraph or a CSRGraph snapshot. Both
+identify vertices by small integer ids and provide vertex_ids, 
+id_bound, id_of, label_of, out_edges, in_edges, in_edge_view, 
+negative_edge, vertex_item and edge_item for the algorithms to work 
+with. The algorithms keep their state in lists indexed by id and 
+translate ids to labels or vertices only in their results, passing 
+edge_item the weight they already hold so that a snapshot need not 
+search for the edge.
 """
 
-from linkedstack import LinkedStack
-from arrayheap import ArrayHeap
-from node import Node
+from arraystack import ArrayStack
+from arrayheap import ArrayHeap, IndexedArrayHeap
+from csrgraph import CSRGraph, attach
+from pathmatrix import PathMatrices, INF
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+import instrument
 
 INFINITY = "-"
 
+# span_tree uses Kruskal's algorithm for undirected graphs with at most
+# this many edges per vertex
+SPARSE_DEGREE = 8
+
+# Marks a missing edge where None could be a weight
+_MISSING = object()
+
+
+# Depth-first traversal states
+UNVISITED = 0
+ON_PATH = 1
+DONE = 2
+
+
+class CycleError(Exception):
+    """Raised when a graph that must be acyclic contains a cycle. The 
+    cycle attribute lists the labels along the cycle, starting and 
+    ending with the same label.
+    """
+
+    def __init__(self, cycle: list):
+        Exception.__init__(self, f"Cycle {'>'.join(map(str, cycle))}")
+        self.cycle = cycle
+
 
-def topo_sort(graph, start_label: str = None) -> LinkedStack:
+class NegativeWeightError(ValueError):
+    """Raised when a shortest path search, which needs weights of 0 or
+    more, reaches an edge with a negative weight. The labels attribute
+    is the (from, to) pair of the vertices the search was at, in the 
+    direction of the search.
+    """
+
+    def __init__(self, from_label, to_label):
+        ValueError.__init__(self, "Negative weight between "
+                            f"{from_label} and {to_label}")
+        self.labels = (from_label, to_label)
+
+
+def topo_sort(graph, start_label: str = None) -> ArrayStack:
     """Returns a stack of vertices representing a topological order of
-    vertices in the graph.
+    vertices in the graph. Popping the stack yields each vertex before 
+    the vertices it has edges to. Raises CycleError if the graph has a
+    cycle.
     """  
-    stack = LinkedStack()
-    graph.clear_vertex_marks()
-    for vertex in graph.get_vertices():
-        if not vertex.is_marked():
-            dfs(graph, vertex, stack)
+    stack = ArrayStack()
+    state = [UNVISITED] * graph.id_bound()
+    with instrument.phase("search"):
+        for vertex in graph.vertex_ids():
+            if state[vertex] == UNVISITED:
+                dfs(graph, vertex, stack, state)
+    if instrument.active is not None:
+        instrument.active.vertices_visited += len(graph)
     return stack
 
 
-def dfs(graph, vertex: Node, stack: LinkedStack):
-    """Recursive depth-first traversal."""
-    vertex.set_mark()
-    stack.push(vertex)
-    for neighbor in graph.neighboring_vertices(vertex.get_label()):
-        if not neighbor.is_marked():
-            dfs(graph, neighbor, stack)
+def dfs(graph, vertex, stack: ArrayStack, state: list):
+    """Iterative depth-first traversal that pushes vertices onto stack 
+    in post-order, where state holds the traversal state of each vertex
+    id. Raises CycleError if it reaches a vertex on the current path.
+    """
+    state[vertex] = ON_PATH
+    path = [vertex]
+    pending = [graph.out_edges(vertex)]
+    while pending:
+        for neighbor, weight in pending[-1]:
+            status = state[neighbor]
+            if status == UNVISITED:
+                state[neighbor] = ON_PATH
+                path.append(neighbor)
+                pending.append(graph.out_edges(neighbor))
+                break
+            elif status == ON_PATH:
+                cycle = path[path.index(neighbor):] + [neighbor]
+                raise CycleError([graph.label_of(v) for v in cycle])
+        else:
+            vertex = path.pop()
+            pending.pop()
+            state[vertex] = DONE
+            stack.push(graph.vertex_item(vertex))
+
+
+def topo_sort_kahn(graph, start_label: str = None) -> ArrayStack:
+    """Returns the same kind of stack as topo_sort, computed with 
+    Kahn's algorithm by repeatedly removing vertices that have no 
+    incoming edges. Raises CycleError if the graph has a cycle.
+    """
+    with instrument.phase("in_degree"):
+        in_degree = [0] * graph.id_bound()
+        for vertex in graph.vertex_ids():
+            for neighbor, weight in graph.out_edges(vertex):
+                in_degree[neighbor] += 1
+    with instrument.phase("search"):
+        # order doubles as the queue of vertices whose in-degree is zero
+        order = [vertex for vertex in graph.vertex_ids() 
+                 if in_degree[vertex] == 0]
+        front = 0
+        while front < len(order):
+            vertex = order[front]
+            front += 1
+            for neighbor, weight in graph.out_edges(vertex):
+                in_degree[neighbor] -= 1
+                if in_degree[neighbor] == 0:
+                    order.append(neighbor)
+    if instrument.active is not None:
+        instrument.active.vertices_visited += len(order)
+    if len(order) < len(graph):
+        # Every vertex left over lies on or behind a cycle
+        state = [UNVISITED] * graph.id_bound()
+        for vertex in order:
+            state[vertex] = DONE
+        for vertex in graph.vertex_ids():
+            if state[vertex] == UNVISITED:
+                dfs(graph, vertex, ArrayStack(), state)
+    stack = ArrayStack()
+    for vertex in reversed(order):
+        stack.push(graph.vertex_item(vertex))
+    return stack
 
 
 def shortest_paths(graph, start_label: str) -> list[list]:
@@ -41,45 +151,326 @@ def shortest_paths(graph, start_label: str) -> list[list]:
     vertices. The second column contains the distance from the start 
     vertex to this vertex. The third column contains the immediate 
     parent vertex of this vertex, if there is one, or None otherwise.
+    Raises NegativeWeightError if a reachable edge has a negative 
+    weight.
     """
+    rows = [None] * graph.id_bound()
+    labels = []
+    for vertex in graph.vertex_ids():
+        rows[vertex] = len(labels)
+        labels.append(graph.label_of(vertex))
+    distances, parents = dijkstra(graph, graph.id_of(start_label), rows)
+    with instrument.phase("results"):
+        return [[labels[row], 
+                 INFINITY if distances[row] == INF else distances[row], 
+                 None if parents[row] is None else labels[parents[row]]]
+                for row in range(len(labels))]
+
 
-    # Initialization Step
+def dijkstra(graph, source, rows) -> tuple[list, list]:
+    """Returns lists of distances and parents for the shortest paths 
+    from the vertex with id source, where rows[id] is the position of 
+    each vertex id in the lists. Unreachable vertices have the distance 
+    INF, and parents are given as rows, or None for no parent. Raises
+    NegativeWeightError if it reaches an edge with a negative weight.
+    """
     n = len(graph)
+    distances = [INF] * n
+    parents = [None] * n
     included = [False] * n
-    results = [[None] * 3 for i in range(n)]
-    source = graph.get_vertex(start_label)
-    row = 0
-    for vertex in graph.get_vertices():
-        to_vertex = vertex.get_label()
-        results[row][0] = to_vertex
-        if vertex == source:
-            results[row][1] = 0
+    row = rows[source]
+    distances[row] = 0
+
+    # Heap entries are (distance, row, vertex). The row breaks ties in
+    # favor of the earliest vertex, and stale entries for vertices that
+    # are already included are skipped when popped.
+    stats = instrument.active
+    heap = ArrayHeap()
+    heap.add((0, row, source))
+    with instrument.phase("search"):
+        while not heap.is_empty():
+            distance, row, vertex = heap.pop()
+            if included[row]:
+                continue
             included[row] = True
-        elif graph.contains_edge(start_label, to_vertex):
-            weight = source.get_edge_to(vertex).get_weight()
-            results[row][1] = weight
-            results[row][2] = start_label
+            if stats is not None:
+                stats.vertices_visited += 1
+            for to_vertex, weight in graph.out_edges(vertex):
+                if stats is not None:
+                    stats.edges_relaxed += 1
+                # Edges into included vertices are checked too, since
+                # a negative one could shorten their distances
+                if weight < 0:
+                    raise NegativeWeightError(graph.label_of(vertex),
+                                              graph.label_of(to_vertex))
+                to_row = rows[to_vertex]
+                if included[to_row]:
+                    continue
+                new_distance = distance + weight
+                if new_distance < distances[to_row]:
+                    distances[to_row] = new_distance
+                    parents[to_row] = row
+                    heap.add((new_distance, to_row, to_vertex))
+    return distances, parents
+
+
+def shortest_path(graph, source_label, target_label, 
+                  heuristic=None) -> tuple[list, object]:
+    """Returns a (path, cost) pair for a shortest path from the vertex
+    with source_label to the vertex with target_label, where path lists
+    the labels along the path, or ([], INFINITY) if there is no path. 
+    The search stops as soon as the path is known. If heuristic is 
+    given, uses A* search, where heuristic(label, target_label) must 
+    never overestimate the cost from the vertex with label to the 
+    target. Otherwise, uses bidirectional Dijkstra, searching backward
+    from the target along the graph's in_edge_view, which takes O(V + E)
+    time per query on a linked graph without an in-edge index. Raises 
+    NegativeWeightError if any edge of the graph has a negative weight,
+    since a search that stops early cannot tell whether an edge it has 
+    not reached would shorten the path.
+    """
+    source = graph.id_of(source_label)
+    target = graph.id_of(target_label)
+    negative = graph.negative_edge()
+    if negative is not None:
+        raise NegativeWeightError(graph.label_of(negative[0]),
+                                  graph.label_of(negative[1]))
+    with instrument.phase("search"):
+        if heuristic is None:
+            path, cost = bidirectional_dijkstra(graph, source, target)
         else:
-            results[row][1] = INFINITY
-        row += 1
+            path, cost = a_star(graph, source, target, 
+                                lambda vertex: heuristic(
+                                    graph.label_of(vertex), target_label))
+    return [graph.label_of(vertex) for vertex in path], cost
 
-    # Computation Step
-    while False in included:
-        f = results[included.index(False)]
-        for i in range(n):
-            if not included[i] and is_less_with_infinity(results[i][1], f[1]):
-                f = results[i]
-        included[results.index(f)] = True
+
+def bidirectional_dijkstra(graph, source, target) -> tuple[list, object]:
+    """Returns a (path, cost) pair for a shortest path between the 
+    vertices with ids source and target, where path lists vertex ids, or
+    ([], INFINITY) if there is no path. Alternately settles the closer 
+    vertex of a forward search from source and a backward search from 
+    target, and stops once no path through an unsettled vertex can be 
+    shorter than the best path found where the searches meet. The 
+    weights must be 0 or more.
+    """
+    if source == target:
+        return [source], 0
+    stats = instrument.active
+    # The searches touch few vertices, so their state is kept in 
+    # dictionaries rather than lists over every vertex id
+    forward = (graph.out_edges, {source: 0}, {source: None}, 
+               IndexedArrayHeap([(0, source)]), set())
+    backward = (graph.in_edge_view(), {target: 0}, {target: None},
+                IndexedArrayHeap([(0, target)]), set())
+    best = None
+    meeting = None
+    while not forward[3].is_empty() and not backward[3].is_empty():
+        forward_top = forward[3].peek()[0]
+        backward_top = backward[3].peek()[0]
+        if best is not None and forward_top + backward_top >= best:
+            break
+        if forward_top <= backward_top:
+            side, other = forward, backward
+        else:
+            side, other = backward, forward
+        edges, distances, parents, heap, settled = side
+        other_distances = other[1]
+        distance, vertex = heap.pop()
+        settled.add(vertex)
+        if stats is not None:
+            stats.vertices_visited += 1
+        for neighbor, weight in edges(vertex):
+            if stats is not None:
+                stats.edges_relaxed += 1
+            if neighbor in settled:
+                continue
+            new_distance = distance + weight
+            old_distance = distances.get(neighbor)
+            if old_distance is None:
+                heap.push(neighbor, new_distance)
+            elif new_distance < old_distance:
+                heap.decrease_key(neighbor, new_distance)
+            else:
+                continue
+            distances[neighbor] = new_distance
+            parents[neighbor] = vertex
+            if neighbor in other_distances:
+                total = new_distance + other_distances[neighbor]
+                if best is None or total < best:
+                    best, meeting = total, neighbor
+    if best is None:
+        return [], INFINITY
+    path = _path_to(meeting, forward[2])
+    path.reverse()
+    path.extend(_path_to(meeting, backward[2])[1:])
+    return path, best
+
+
+def a_star(graph, source, target, estimate) -> tuple[list, object]:
+    """Returns a (path, cost) pair for a shortest path between the 
+    vertices with ids source and target, where path lists vertex ids, or
+    ([], INFINITY) if there is no path. Vertices are settled in order of
+    their distance plus estimate(vertex), a lower bound on their 
+    remaining cost to target. A vertex reached again by a shorter path
+    is searched again, so the estimate need not be consistent. The 
+    weights must be 0 or more.
+    """
+    stats = instrument.active
+    distances = {source: 0}
+    parents = {source: None}
+    estimates = {}
+    heap = IndexedArrayHeap([(estimate(source), source)])
+    while not heap.is_empty():
+        priority, vertex = heap.pop()
+        if vertex == target:
+            path = _path_to(target, parents)
+            path.reverse()
+            return path, distances[target]
+        if stats is not None:
+            stats.vertices_visited += 1
+        distance = distances[vertex]
+        for neighbor, weight in graph.out_edges(vertex):
+            if stats is not None:
+                stats.edges_relaxed += 1
+            new_distance = distance + weight
+            old_distance = distances.get(neighbor)
+            if old_distance is not None and new_distance >= old_distance:
+                continue
+            distances[neighbor] = new_distance
+            parents[neighbor] = vertex
+            if neighbor not in estimates:
+                estimates[neighbor] = estimate(neighbor)
+            priority = new_distance + estimates[neighbor]
+            if neighbor in heap:
+                heap.decrease_key(neighbor, priority)
+            else:
+                heap.push(neighbor, priority)
+    return [], INFINITY
+
+
+def _path_to(vertex, parents: dict) -> list:
+    """Returns the list of vertices from vertex back to the root of 
+    the parents tree.
+    """
+    path = []
+    while vertex is not None:
+        path.append(vertex)
+        vertex = parents[vertex]
+    return path
+
+
+# The graph and matrices attached by each all_pairs_shortest_paths worker
+_all_pairs_block = None
+_all_pairs_graph = None
+_all_pairs_matrices = None
+
+
+def all_pairs_shortest_paths(graph, workers: int = None, path: str = None,
+                             chunk_rows: int = 64) -> PathMatrices:
+    """Returns PathMatrices holding the shortest paths between all 
+    pairs of vertices, with vertex ids in the order of the graph's 
+    vertices. Runs Dijkstra's algorithm from each vertex in chunks of 
+    chunk_rows sources on a pool of worker processes, which receive 
+    the graph once as shared CSR arrays and write their rows straight 
+    into the matrices. The matrices are kept in shared memory, or in a
+    memory-mapped file at path, which lets them outgrow RAM. If 
+    workers is 1, runs in the calling process instead and keeps the 
+    matrices in its memory unless path is given. Call close on the 
+    matrices, or use them in a with statement, when done with them.
+    """
+    snapshot = graph if isinstance(graph, CSRGraph) else graph.freeze()
+    labels = [snapshot.label_of(vertex) for vertex in snapshot.vertex_ids()]
+    matrices = PathMatrices(labels, path, shared=workers != 1)
+    chunks = [(first, min(first + chunk_rows, len(labels)))
+              for first in range(0, len(labels), chunk_rows)]
+    if workers == 1:
+        for first, stop in chunks:
+            _all_pairs_rows(snapshot, matrices, first, stop)
+        return matrices
+    block, description = snapshot.share()
+    try:
+        with ProcessPoolExecutor(workers, initializer=_attach_all_pairs,
+                                 initargs=(description, labels,
+                                           matrices.describe())) as executor:
+            for future in [executor.submit(_all_pairs_chunk, first, stop)
+                           for first, stop in chunks]:
+                future.result()
+    except BaseException:
+        matrices.close()
+        raise
+    finally:
+        block.close()
+        block.unlink()
+    return matrices
+
+
+def _attach_all_pairs(description, labels, matrices_description):
+    """Attaches a worker process to the shared graph and matrices."""
+    global _all_pairs_block, _all_pairs_graph, _all_pairs_matrices
+    _all_pairs_block, _all_pairs_graph = attach(description)
+    _all_pairs_matrices = PathMatrices(labels, 
+                                       description=matrices_description)
+
+
+def _all_pairs_chunk(first: int, stop: int):
+    """Fills in the matrix rows first to stop - 1 in a worker."""
+    _all_pairs_rows(_all_pairs_graph, _all_pairs_matrices, first, stop)
+
+
+def _all_pairs_rows(graph: CSRGraph, matrices: PathMatrices, first: int, 
+                    stop: int):
+    """Runs Dijkstra's algorithm from the vertices with ids first to 
+    stop - 1 and stores the results in matrices.
+    """
+    rows = range(len(graph))
+    for source in range(first, stop):
+        distances, parents = dijkstra(graph, source, rows)
+        matrices.set_row(source, distances,
+                         [-1 if p is None else p for p in parents])
+    matrices.flush()
+
+
+def floyd_warshall(graph, path: str = None) -> PathMatrices:
+    """Returns PathMatrices holding the shortest paths between all 
+    pairs of vertices, computed with the Floyd-Warshall algorithm in
+    O(N^3) time. Each step updates a whole row at once, which suits
+    small, dense graphs, and negative weights are allowed as long as 
+    there are no negative cycles. The matrices are kept in the memory
+    of the process, or in a memory-mapped file at path. Call close on 
+    the matrices, or use them in a with statement, when done with them.
+    """
+    snapshot = graph if isinstance(graph, CSRGraph) else graph.freeze()
+    n = len(snapshot)
+    distances = [[INF] * n for i in range(n)]
+    parents = [[-1] * n for i in range(n)]
+    for i in range(n):
+        distances[i][i] = 0
+        for j, weight in snapshot.out_edges(i):
+            if i != j and weight < distances[i][j]:
+                distances[i][j] = weight
+                parents[i][j] = i
+    for k in range(n):
+        row_k = distances[k]
+        parents_k = parents[k]
         for i in range(n):
-            if not included[i]:
-                t = results[i]
-                if graph.contains_edge(f[0], t[0]):
-                    new_distance = (f[1] 
-                                    + graph.get_edge(f[0], t[0]).get_weight())
-                    if is_less_with_infinity(new_distance, t[1]):
-                        t[1] = new_distance
-                        t[2] = f[0]
-    return results
+            d_ik = distances[i][k]
+            if d_ik == INF:
+                continue
+            row_i = distances[i]
+            through_k = [d_ik + d_kj for d_kj in row_k]
+            if any(d_ikj < d_ij for d_ij, d_ikj in zip(row_i, through_k)):
+                distances[i] = [min(d_ij, d_ikj) 
+                                for d_ij, d_ikj in zip(row_i, through_k)]
+                parents[i] = [p_kj if d_ikj < d_ij else p_ij
+                              for d_ij, d_ikj, p_ij, p_kj 
+                              in zip(row_i, through_k, parents[i], parents_k)]
+    matrices = PathMatrices(
+        [snapshot.label_of(vertex) for vertex in snapshot.vertex_ids()], path,
+        shared=False)
+    for i in range(n):
+        matrices.set_row(i, distances[i], parents[i])
+    return matrices
 
 
 def add_with_infinity(a, b):
@@ -99,25 +490,147 @@ def is_less_with_infinity(a, b) -> bool:
     else: return a < b
 
 
-def span_tree(graph, start_label: str) -> list:
-    """Returns a list containing the edges in the minimum spanning tree
-    of the graph.
+def span_tree(graph, start_label: str = None) -> list:
+    """Returns a list containing the edges in the minimum spanning 
+    forest of the graph. Uses Kruskal's algorithm when the graph is 
+    sparse and undirected, that is, each edge has a reverse edge of the 
+    same weight, and Prim's algorithm otherwise.
     """
-    graph.clear_vertex_marks()
-    graph.clear_edge_marks()
-    vertex = graph.get_vertex(start_label)
-    vertex.set_mark()
-    heap = ArrayHeap()
-    for edge in vertex.incident_edges():
-        heap.add(edge)
-    k = 1
-    while k < len(graph):
-        edge = heap.pop()
-        w = edge.get_to_vertex()
-        if not w.is_marked():
-            edge.set_mark()
-            w.set_mark()
-            for e in w.incident_edges():
-                heap.add(e)
-            k += 1
-    return [edge for edge in graph.edges() if edge.is_marked()]
\ No newline at end of file
+    if graph.size_edges() <= SPARSE_DEGREE * len(graph):
+        edges = _sorted_edges(graph)
+        if edges is not None:
+            return _kruskal(graph, edges)
+    return span_tree_prim(graph, start_label)
+
+
+def span_tree_prim(graph, start_label: str = None) -> list:
+    """Returns a list containing the edges in the minimum spanning 
+    forest of the graph, grown with Prim's algorithm along outgoing 
+    edges. The first tree grows from start_label, and each later tree 
+    from the first vertex that is not yet spanned.
+    """
+    tree = []
+    marked = [False] * graph.id_bound()
+    # Each unmarked vertex next to the forest is keyed by the cheapest
+    # edge reaching it, as (weight, sequence). The sequence number keeps
+    # the earliest of equally cheap edges, and the heap holds at most
+    # one entry per vertex. The key of a popped vertex gives the weight
+    # of its tree edge.
+    heap = IndexedArrayHeap()
+    parents = [None] * graph.id_bound()
+    spanned = 0
+    examined = 0
+    roots = graph.vertex_ids()
+    if start_label is not None:
+        roots = chain([graph.id_of(start_label)], roots)
+    with instrument.phase("search"):
+        for root in roots:
+            if marked[root]:
+                continue
+            heap.push(root, (0, examined))
+            while not heap.is_empty():
+                priority, v = heap.pop()
+                marked[v] = True
+                spanned += 1
+                if parents[v] is not None:
+                    tree.append(graph.edge_item(parents[v], v, priority[0]))
+                for w, weight in graph.out_edges(v):
+                    examined += 1
+                    if marked[w]:
+                        continue
+                    if w not in heap:
+                        heap.push(w, (weight, examined))
+                        parents[w] = v
+                    elif weight < heap.get_priority(w)[0]:
+                        heap.decrease_key(w, (weight, examined))
+                        parents[w] = v
+    if instrument.active is not None:
+        instrument.active.vertices_visited += spanned
+        instrument.active.edges_relaxed += examined
+    return tree
+
+
+def span_tree_kruskal(graph, start_label: str = None) -> list:
+    """Returns a list containing the edges in the minimum spanning 
+    forest of the graph, found with Kruskal's algorithm. Edges are 
+    treated as undirected, so start_label is not needed.
+    """
+    edges = _sorted_edges(graph, False)
+    return _kruskal(graph, edges)
+
+
+def _sorted_edges(graph, undirected_only: bool = True) -> list:
+    """Returns the edges of the graph as (weight, from_id, to_id) tuples
+    sorted by weight and then by ids, keeping one edge of each pair of 
+    reverse edges with the same weight. Returns None if undirected_only
+    is True and some edge has no such reverse edge, as soon as that is
+    found.
+    """
+    scanned = [False] * graph.id_bound()
+    # The edges to vertices not scanned yet, whose reverse edges have 
+    # not been seen, as (from_id, to_id): weight
+    pending = {}
+    edges = []
+    for v in graph.vertex_ids():
+        scanned[v] = True
+        for w, weight in graph.out_edges(v):
+            if v == w:
+                continue
+            if not scanned[w]:
+                pending[(v, w)] = weight
+                continue
+            reverse = pending.pop((w, v), _MISSING)
+            if reverse is not _MISSING and reverse == weight:
+                edges.append((weight, min(v, w), max(v, w)))
+            elif undirected_only:
+                return None
+            else:
+                if reverse is not _MISSING:
+                    edges.append((reverse, w, v))
+                edges.append((weight, v, w))
+    if pending:
+        if undirected_only:
+            return None
+        edges.extend((weight, v, w) for (v, w), weight in pending.items())
+    edges.sort()
+    return edges
+
+
+def _kruskal(graph, edges: list) -> list:
+    """Returns the edges of the minimum spanning forest, taking edges 
+    from the sorted edges list while they join two different trees.
+    """
+    n = len(graph)
+    # The trees are a union-find structure over the vertex ids, with 
+    # path compression and union by rank
+    parent = list(range(graph.id_bound()))
+    rank = [0] * graph.id_bound()
+
+    def find(i: int) -> int:
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
+
+    tree = []
+    examined = 0
+    with instrument.phase("search"):
+        for weight, v, w in edges:
+            examined += 1
+            i, j = find(v), find(w)
+            if i == j:
+                continue
+            if rank[i] < rank[j]:
+                i, j = j, i
+            parent[j] = i
+            if rank[i] == rank[j]:
+                rank[i] += 1
+            tree.append(graph.edge_item(v, w, weight))
+            if len(tree) == n - 1:
+                break
+    if instrument.active is not None:
+        instrument.active.vertices_visited += n
+        instrument.active.edges_relaxed += examined
+    return tree
@@ -1,21 +1,33 @@
 """
 File: arrayheap.py
 
-This module defines an ArrayHeap class.
+This module defines an ArrayHeap class and an IndexedArrayHeap class.
 """
 
 from abstractcollection import AbstractCollection
 from typing import Iterable
+import instrument
 
 class ArrayHeap(AbstractCollection):
-    """Array-based min-heap implementation of a priority queue."""
+    """Array-based min-heap implementation of a priority queue. Each
+    node has up to arity children, two by default; a wider heap is
+    shallower, so items move through fewer levels when they sift down.
+    """
 
-    def __init__(self, source_collection=None):
-        self._heap = list()
-        AbstractCollection.__init__(self, source_collection)
+    def __init__(self, source_collection=None, arity: int = 2):
+        """Builds the heap from source_collection, if it's present, in
+        linear time.
+        """
+        if arity < 2:
+            raise ValueError("Arity must be at least 2")
+        self._arity = arity
+        self._heap = list(source_collection) if source_collection else []
+        self._size = len(self._heap)
+        for position in range((len(self._heap) - 2) // arity, -1, -1):
+            self._sift_down(position)
 
     def peek(self):
-        """Returns the topmost item in heap, 
+        """Returns the topmost item in heap,
         otherwise raises an Exception if heap is empty.
         """
         if self.is_empty():
@@ -24,78 +36,276 @@ class ArrayHeap(AbstractCollection):
 
     def __str__(self) -> str:
         """Returns a string that shows the shape of the heap."""
+        arity = self._arity
         def str_helper(position, level) -> str:
             """Assists with formatting."""
             result = ""
             if position < len(self):
-                result += str_helper(2*position + 2, level + 1)
+                children = range(arity*position + 1,
+                                 arity*position + arity + 1)
+                for child in reversed(children[arity//2:]):
+                    result += str_helper(child, level + 1)
                 result += "|" * level
                 result += f"{str(self._heap[position])}\n"
-                result += str_helper(2*position + 1, level + 1)
+                for child in reversed(children[:arity//2]):
+                    result += str_helper(child, level + 1)
             return result
         return str_helper(0, 0)
 
     def __iter__(self) -> Iterable[list]:
-        """Visits the items from least to greatest."""
-        temp_list = list(self._heap)
-        result_list = []
-        while not self.is_empty():
-            result_list.append(self.pop())
-        self._heap = temp_list
-        self._size = len(self._heap)
-        return iter(result_list)
+        """Visits the items from least to greatest, without changing
+        the heap.
+        """
+        return iter(sorted(self._heap))
 
     def add(self, item):
         """Inserts item in its proper place in heap."""
+        if instrument.active is not None:
+            instrument.active.heap_pushes += 1
         self._size += 1
         self._heap.append(item)
-        curr_pos = len(self._heap) - 1
-        while curr_pos > 0:
-            parent = (curr_pos - 1)//2
-            parent_item = self._heap[parent]
-            # Found the spot
-            if parent_item <= item:
-                break
-            # Continue walking up
-            else:
-                self._heap[curr_pos] = self._heap[parent]
-                self._heap[parent] = item
-                curr_pos = parent
+        self._sift_up(len(self._heap) - 1)
 
     def pop(self):
-        """Removes and returns the topmost item in the heap, 
+        """Removes and returns the topmost item in the heap,
         otherwise raises an Exception if heap is empty.
         """
         if self.is_empty():
             raise Exception("Heap is empty")
+        if instrument.active is not None:
+            instrument.active.heap_pops += 1
         self._size -= 1
         top_item = self._heap[0]
         bottom_item = self._heap.pop(len(self._heap) - 1)
         if len(self._heap) == 0:
             return bottom_item
-           
         self._heap[0] = bottom_item
-        last_index = len(self._heap) - 1
-        curr_pos = 0
-        while True:
-            left_child = 2*curr_pos + 1 
-            right_child = 2*curr_pos + 2
-            if left_child > last_index:
+        self._sift_down(0)
+        return top_item
+
+    def pushpop(self, item):
+        """Adds item and then removes and returns the topmost item,
+        which is item itself if it is no greater than the top. Faster
+        than add followed by pop.
+        """
+        if self.is_empty() or item <= self._heap[0]:
+            return item
+        top_item = self._heap[0]
+        self._heap[0] = item
+        self._sift_down(0)
+        return top_item
+
+    def replace(self, item):
+        """Removes and returns the topmost item and then adds item,
+        otherwise raises an Exception if heap is empty. Faster than pop
+        followed by add.
+        """
+        if self.is_empty():
+            raise Exception("Heap is empty")
+        top_item = self._heap[0]
+        self._heap[0] = item
+        self._sift_down(0)
+        return top_item
+
+    def _sift_up(self, curr_pos: int):
+        """Moves the item at curr_pos up to its proper place."""
+        item = self._heap[curr_pos]
+        while curr_pos > 0:
+            parent = (curr_pos - 1)//self._arity
+            parent_item = self._heap[parent]
+            # Found the spot
+            if parent_item <= item:
                 break
-            if right_child > last_index:
-                max_child = left_child;
+            # Continue walking up
             else:
-                left_item  = self._heap[left_child]
-                right_item = self._heap[right_child]
-                if left_item < right_item:
-                    max_child = left_child
-                else:
-                    max_child = right_child
-            max_item = self._heap[max_child]
-            if bottom_item <= max_item:
+                self._heap[curr_pos] = parent_item
+                curr_pos = parent
+        self._heap[curr_pos] = item
+
+    def _sift_down(self, curr_pos: int):
+        """Moves the item at curr_pos down to its proper place."""
+        heap = self._heap
+        item = heap[curr_pos]
+        last_index = len(heap) - 1
+        while True:
+            first_child = self._arity*curr_pos + 1
+            if first_child > last_index:
+                break
+            min_child = first_child
+            for child in range(first_child + 1,
+                               min(first_child + self._arity, last_index + 1)):
+                if heap[child] <= heap[min_child]:
+                    min_child = child
+            if item <= heap[min_child]:
                 break
             else:
-                self._heap[curr_pos] = self._heap[max_child]
-                self._heap[max_child] = bottom_item
-                curr_pos = max_child
-        return top_item
\ No newline at end of file
+                heap[curr_pos] = heap[min_child]
+                curr_pos = min_child
+        heap[curr_pos] = item
+
+
+class IndexedArrayHeap(ArrayHeap):
+    """Array-based min-heap of distinct, hashable keys ordered by their
+    priorities. Tracks the position of every key, so a key's priority
+    can be lowered with decrease_key, or the key removed, in
+    O(log n). Items added or yielded as a collection are
+    (priority, key) pairs.
+    """
+
+    def __init__(self, source_collection=None, arity: int = 2):
+        """Builds the heap from the (priority, key) pairs in
+        source_collection, if it's present, in linear time.
+        """
+        self._priority = {}
+        self._position = {}
+        pairs = list(source_collection) if source_collection else []
+        for priority, key in pairs:
+            if key in self._priority:
+                raise KeyError(f"Duplicate key {key}")
+            self._priority[key] = priority
+        for position, (priority, key) in enumerate(pairs):
+            self._position[key] = position
+        ArrayHeap.__init__(self, [key for priority, key in pairs], arity)
+
+    def __contains__(self, key) -> bool:
+        """Returns True if key is in the heap, or False otherwise."""
+        return key in self._position
+
+    def __iter__(self) -> Iterable[tuple]:
+        """Visits the (priority, key) pairs from least to greatest
+        priority, without changing the heap.
+        """
+        keys = sorted(self._heap, key=self._priority.__getitem__)
+        return iter([(self._priority[key], key) for key in keys])
+
+    def __str__(self) -> str:
+        """Returns a string that shows the shape of the heap."""
+        keys = self._heap
+        self._heap = [(self._priority[key], key) for key in keys]
+        try:
+            return ArrayHeap.__str__(self)
+        finally:
+            self._heap = keys
+
+    def get_priority(self, key):
+        """Returns the priority of key,
+        otherwise raises KeyError if key is not in the heap.
+        """
+        return self._priority[key]
+
+    def peek(self) -> tuple:
+        """Returns the topmost (priority, key) pair in heap,
+        otherwise raises an Exception if heap is empty.
+        """
+        key = ArrayHeap.peek(self)
+        return self._priority[key], key
+
+    def add(self, item: tuple):
+        """Inserts the key of a (priority, key) pair with the given
+        priority, otherwise raises KeyError if the key is already in
+        the heap.
+        """
+        priority, key = item
+        self.push(key, priority)
+
+    def push(self, key, priority):
+        """Inserts key with the given priority, otherwise raises
+        KeyError if the key is already in the heap.
+        """
+        if key in self._position:
+            raise KeyError(f"Duplicate key {key}")
+        self._priority[key] = priority
+        self._position[key] = len(self._heap)
+        ArrayHeap.add(self, key)
+
+    def pop(self) -> tuple:
+        """Removes and returns the topmost (priority, key) pair in the
+        heap, otherwise raises an Exception if heap is empty.
+        """
+        key = ArrayHeap.pop(self)
+        del self._position[key]
+        return self._priority.pop(key), key
+
+    def pushpop(self, item: tuple) -> tuple:
+        """Adds a (priority, key) pair and then removes and returns the
+        topmost pair.
+        """
+        priority, key = item
+        if self.is_empty() or priority <= self._priority[self._heap[0]]:
+            return item
+        self.push(key, priority)
+        return self.pop()
+
+    def replace(self, item: tuple) -> tuple:
+        """Removes and returns the topmost (priority, key) pair and then
+        adds item, otherwise raises an Exception if heap is empty.
+        """
+        top_item = self.pop()
+        self.add(item)
+        return top_item
+
+    def decrease_key(self, key, priority):
+        """Lowers the priority of key to priority, otherwise raises
+        KeyError if key is not in the heap or ValueError if priority is
+        greater than its current priority.
+        """
+        if self._priority[key] < priority:
+            raise ValueError("New priority is greater than the current one")
+        self._priority[key] = priority
+        self._sift_up(self._position[key])
+
+    def remove(self, key):
+        """Removes key from the heap and returns its priority,
+        otherwise raises KeyError if key is not in the heap.
+        """
+        position = self._position.pop(key)
+        priority = self._priority.pop(key)
+        self._size -= 1
+        last_key = self._heap.pop()
+        if position < len(self._heap):
+            self._heap[position] = last_key
+            self._position[last_key] = position
+            self._sift_up(position)
+            self._sift_down(self._position[last_key])
+        return priority
+
+    def _sift_up(self, curr_pos: int):
+        """Moves the key at curr_pos up to its proper place."""
+        heap, priority, position = self._heap, self._priority, self._position
+        key = heap[curr_pos]
+        key_priority = priority[key]
+        while curr_pos > 0:
+            parent = (curr_pos - 1)//self._arity
+            parent_key = heap[parent]
+            if priority[parent_key] <= key_priority:
+                break
+            heap[curr_pos] = parent_key
+            position[parent_key] = curr_pos
+            curr_pos = parent
+        heap[curr_pos] = key
+        position[key] = curr_pos
+
+    def _sift_down(self, curr_pos: int):
+        """Moves the key at curr_pos down to its proper place."""
+        heap, priority, position = self._heap, self._priority, self._position
+        key = heap[curr_pos]
+        key_priority = priority[key]
+        last_index = len(heap) - 1
+        while True:
+            first_child = self._arity*curr_pos + 1
+            if first_child > last_index:
+                break
+            min_child = first_child
+            min_priority = priority[heap[first_child]]
+            for child in range(first_child + 1,
+                               min(first_child + self._arity, last_index + 1)):
+                if priority[heap[child]] <= min_priority:
+                    min_child = child
+                    min_priority = priority[heap[child]]
+            if key_priority <= min_priority:
+                break
+            heap[curr_pos] = heap[min_child]
+            position[heap[curr_pos]] = curr_pos
+            curr_pos = min_child
+        heap[curr_pos] = key
+        position[key] = curr_pos
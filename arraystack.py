@@ -0,0 +1,61 @@
+"""
+File: arraystack.py
+
+This module defines an ArrayStack class.
+"""
+
+from abstractstack import AbstractStack
+from typing import Iterable
+
+
+class ArrayStack(AbstractStack):
+    """An array-based stack implementation. Items are kept in a Python
+    list with the top of the stack at its end, so push and pop take
+    amortized constant time and iteration needs no recursion.
+    """
+
+    def __init__(self, source_collection=None):
+        """Sets the initial state of self, which includes the contents 
+        of source_collection, if it's present.
+        """
+        self._items = list()
+        AbstractStack.__init__(self, source_collection)
+
+    def peek(self):
+        """Returns the item at the top of the stack, 
+        otherwise raises KeyError if the stack is empty.
+        """
+        if self.is_empty():
+            raise KeyError("The stack is empty")
+        return self._items[-1]
+
+    def __iter__(self) -> Iterable[list]:
+        """Supports iteration over a view of self, from the bottom of 
+        the stack to the top.
+        """
+        return iter(self._items)
+
+    def __reversed__(self) -> Iterable[list]:
+        """Supports iteration over a view of self, from the top of the
+        stack to the bottom, which is the order of popping.
+        """
+        return reversed(self._items)
+
+    def clear(self):
+        """Clears the stack."""
+        self._size = 0
+        self._items = list()
+
+    def push(self, item):
+        """Adds item to the top of the stack."""
+        self._items.append(item)
+        self._size += 1
+
+    def pop(self):
+        """Removes and returns the item at the top of the stack,
+        otherwise raises KeyError if the stack is empty.
+        """
+        if self.is_empty():
+            raise KeyError("The stack is empty")
+        self._size -= 1
+        return self._items.pop()
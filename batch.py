@@ -0,0 +1,101 @@
+"""
+File: batch.py
+
+This module runs queries against a graph without user interaction. Each
+query is a JSON object on its own line, such as
+{"algorithm": "shortest_paths", "start_label": "A"}. The graph is loaded
+once, and each result is written as a JSON line as soon as it is ready.
+"""
+
+import json
+from abstractstack import AbstractStack
+from algorithms import (shortest_paths, span_tree, span_tree_prim,
+                        span_tree_kruskal, topo_sort, topo_sort_kahn)
+from graphfile import is_graph_file
+from model import GraphDemoModel
+
+# The algorithms that queries can name
+ALGORITHMS = {
+    "shortest_paths": shortest_paths,
+    "span_tree": span_tree,
+    "span_tree_prim": span_tree_prim,
+    "span_tree_kruskal": span_tree_kruskal,
+    "topo_sort": topo_sort,
+    "topo_sort_kahn": topo_sort_kahn,
+}
+
+
+def to_json(result):
+    """Returns result in a form that json can encode. Stacks become
+    lists in pop order, and vertices and edges become strings.
+    """
+    if isinstance(result, AbstractStack):
+        return [to_json(item) for item in reversed(list(result))]
+    elif isinstance(result, (list, tuple)):
+        return [to_json(item) for item in result]
+    elif result is None or isinstance(result, (str, int, float, bool)):
+        return result
+    else:
+        return str(result)
+
+
+def load_model(path: str) -> tuple:
+    """Returns a (model, message) pair for a model holding the graph in
+    the binary graph file or edge file at path. The message starts 
+    with "Error" if the graph could not be loaded.
+    """
+    model = GraphDemoModel()
+    try:
+        graph_file = is_graph_file(path)
+    except OSError:
+        return model, "Error: Could not read the file"
+    if graph_file:
+        message = model.load_graph(path)
+    else:
+        message = model.load_edge_file(path)
+    return model, message
+
+
+def run_query(model: GraphDemoModel, query: dict,
+              start_label: str = None) -> dict:
+    """Runs one query and returns a dictionary with the query's fields
+    and either a result or an error. The query's start_label defaults 
+    to start_label, and then to the model's start label.
+    """
+    response = dict(query)
+    algorithm = ALGORITHMS.get(query.get("algorithm"))
+    start_label = query.get("start_label", 
+                            start_label or model.get_start_label())
+    if algorithm is None:
+        response["error"] = f"Unknown algorithm {query.get('algorithm')}"
+    elif not model.contains_vertex(start_label):
+        response["error"] = f"Start label {start_label} not in graph"
+    else:
+        # One failed query, such as a sort of a cyclic graph, must not
+        # stop the rest of the batch
+        try:
+            response["result"] = to_json(model.run(algorithm, start_label))
+        except Exception as error:
+            response["error"] = str(error)
+    return response
+
+
+def run_batch(model: GraphDemoModel, lines, out, start_label: str = None):
+    """Runs the query on each JSON line of lines and writes one JSON
+    line per query to out. Blank lines are skipped, and lines that are
+    not JSON objects produce an error line. Queries without a start 
+    label use start_label, or the model's start label.
+    """
+    for number, line in enumerate(lines, 1):
+        if line.strip() == "":
+            continue
+        try:
+            query = json.loads(line)
+            if not isinstance(query, dict):
+                raise ValueError("Query must be a JSON object")
+        except ValueError as error:
+            response = {"line": number, "error": str(error)}
+        else:
+            response = run_query(model, query, start_label)
+        out.write(json.dumps(response) + "\n")
+        out.flush()
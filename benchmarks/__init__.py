@@ -0,0 +1,7 @@
+"""
+Package: benchmarks
+
+Seeded synthetic graph generators and a runner that times the graph
+operations across sizes. Run it from the repository root with
+python3 -m benchmarks.
+"""
@@ -0,0 +1,10 @@
+"""
+File: benchmarks/__main__.py
+
+Runs the benchmark suite from the command line.
+"""
+
+import sys
+from benchmarks.runner import main
+
+sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+File: benchmarks/generators.py
+
+This module generates synthetic graphs as lists of (from_label,
+to_label, weight) edges. Every generator takes a seed, so the same
+arguments always produce the same graph, and labels vertex i as Vi.
+"""
+
+import random
+from math import isqrt
+
+
+def label(i: int) -> str:
+    """Returns the label of vertex i."""
+    return f"V{i}"
+
+
+def to_rep(edges: list) -> str:
+    """Returns edges in the src>dest:weight format of create_graph."""
+    return " ".join(f"{src}>{dest}:{weight}" for src, dest, weight in edges)
+
+
+def random_graph(n: int, degree: int = 4, seed: int = 0,
+                 max_weight: int = 100) -> list:
+    """Returns about n * degree random edges between n vertices, with
+    no self-loops or duplicate edges. A path V0>V1>...>Vn-1 is included
+    so that every vertex is reachable from V0.
+    """
+    rng = random.Random(seed)
+    pairs = set()
+    edges = []
+    for i in range(1, n):
+        pairs.add((i - 1, i))
+        edges.append((label(i - 1), label(i), rng.randint(1, max_weight)))
+    for k in range(max(0, n * degree - (n - 1))):
+        src, dest = rng.randrange(n), rng.randrange(n)
+        if src != dest and (src, dest) not in pairs:
+            pairs.add((src, dest))
+            edges.append((label(src), label(dest), rng.randint(1, max_weight)))
+    return edges
+
+
+def grid_graph(n: int, seed: int = 0, max_weight: int = 100) -> list:
+    """Returns the edges of a square grid of about n vertices, where
+    each vertex has an edge to and from each of its neighbors.
+    """
+    rng = random.Random(seed)
+    side = max(1, isqrt(n))
+    edges = []
+    for row in range(side):
+        for column in range(side):
+            i = row * side + column
+            neighbors = []
+            if column + 1 < side:
+                neighbors.append(i + 1)
+            if row + 1 < side:
+                neighbors.append(i + side)
+            for j in neighbors:
+                edges.append((label(i), label(j), rng.randint(1, max_weight)))
+                edges.append((label(j), label(i), rng.randint(1, max_weight)))
+    return edges
+
+
+def scale_free_graph(n: int, degree: int = 3, seed: int = 0,
+                     max_weight: int = 100) -> list:
+    """Returns the edges of a Barabasi-Albert graph on n vertices. Each
+    new vertex links to up to degree existing vertices chosen with
+    probability proportional to their degree, giving a power-law degree
+    distribution. Edges run both ways, so the graph is connected.
+    """
+    rng = random.Random(seed)
+    edges = []
+    # Each vertex appears here once per edge it touches
+    ends = [0]
+    for i in range(1, n):
+        targets = {rng.choice(ends) for k in range(min(degree, i))}
+        for j in targets:
+            edges.append((label(i), label(j), rng.randint(1, max_weight)))
+            edges.append((label(j), label(i), rng.randint(1, max_weight)))
+            ends.extend((i, j))
+    return edges
+
+
+def layered_dag(n: int, layers: int = 10, degree: int = 3, seed: int = 0,
+                max_weight: int = 100) -> list:
+    """Returns the edges of a directed acyclic graph whose n vertices
+    are split into layers, with each vertex linking to up to degree
+    vertices of the next layer.
+    """
+    rng = random.Random(seed)
+    layers = max(1, min(layers, n))
+    size = -(-n // layers)
+    edges = []
+    for i in range(n):
+        start = (i // size + 1) * size
+        stop = min(start + size, n)
+        if start < stop:
+            for j in set(rng.randrange(start, stop) for k in range(degree)):
+                edges.append((label(i), label(j), rng.randint(1, max_weight)))
+    return edges
+
+
+# The generators by name
+GENERATORS = {
+    "random": random_graph,
+    "grid": grid_graph,
+    "scale_free": scale_free_graph,
+    "layered_dag": layered_dag,
+}
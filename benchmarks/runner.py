@@ -0,0 +1,228 @@
+"""
+File: benchmarks/runner.py
+
+This module times graph operations across graph sizes, records their
+peak memory with tracemalloc, writes the results as JSON and compares
+them against a saved baseline. A run fails when an operation is slower
+than its baseline by more than the tolerance.
+
+Example:
+    python3 -m benchmarks --sizes 100,1000,10000 --output new.json
+    python3 -m benchmarks --baseline new.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from algorithms import (shortest_paths, shortest_path, span_tree, 
+                        span_tree_kruskal,
+                        topo_sort, topo_sort_kahn)
+from arrayheap import ArrayHeap
+from arraystack import ArrayStack
+from graph import LinkedDirectedGraph
+from linkedstack import LinkedStack
+from model import GraphDemoModel
+from benchmarks.generators import GENERATORS, to_rep
+
+DEFAULT_SIZES = [100, 1000, 10000]
+
+# Baseline times below this many seconds are too noisy to compare
+MIN_SECONDS = 0.001
+
+
+def build_graph(edges: list) -> LinkedDirectedGraph:
+    """Returns a LinkedDirectedGraph with the given edges."""
+    graph = LinkedDirectedGraph()
+    graph.add_edges_from(edges)
+    return graph
+
+
+def setup_create_graph(edges: list, n: int, seed: int):
+    """Returns a function that builds a graph from its text form."""
+    rep = to_rep(edges)
+    return lambda: GraphDemoModel().create_graph(rep, "V0")
+
+
+def setup_create_flyweight_graph(edges: list, n: int, seed: int):
+    """Returns a function that builds a graph with flyweight edges from
+    its text form.
+    """
+    rep = to_rep(edges)
+    return lambda: GraphDemoModel(flyweight=True).create_graph(rep, "V0")
+
+
+def setup_algorithm(algorithm):
+    """Returns a setup function for a graph-processing algorithm."""
+    def setup(edges: list, n: int, seed: int):
+        graph = build_graph(edges)
+        return lambda: algorithm(graph, "V0")
+    return setup
+
+
+def setup_shortest_path(edges: list, n: int, seed: int):
+    """Returns a function that finds a shortest path from V0 to the 
+    last vertex added to the graph.
+    """
+    graph = build_graph(edges)
+    target = graph.label_of(list(graph.vertex_ids())[-1])
+    return lambda: shortest_path(graph, "V0", target)
+
+
+def setup_array_heap(edges: list, n: int, seed: int):
+    """Returns a function that adds n random items to an ArrayHeap
+    and pops them all.
+    """
+    items = [random.Random(seed).random() for i in range(n)]
+
+    def run():
+        heap = ArrayHeap()
+        for item in items:
+            heap.add(item)
+        while not heap.is_empty():
+            heap.pop()
+    return run
+
+
+def setup_array_stack(edges: list, n: int, seed: int):
+    """Returns a function that pushes n items onto an ArrayStack and
+    pops them all.
+    """
+    def run():
+        stack = ArrayStack()
+        for item in range(n):
+            stack.push(item)
+        while not stack.is_empty():
+            stack.pop()
+    return run
+
+
+def setup_linked_stack(edges: list, n: int, seed: int):
+    """Returns a function that pushes n items onto a LinkedStack and
+    pops them all.
+    """
+    def run():
+        stack = LinkedStack()
+        for item in range(n):
+            stack.push(item)
+        while not stack.is_empty():
+            stack.pop()
+    return run
+
+
+# Each operation's setup function and the generator for its graph, or
+# None if it needs no graph
+OPERATIONS = {
+    "create_graph": (setup_create_graph, "random"),
+    "create_flyweight_graph": (setup_create_flyweight_graph, "random"),
+    "shortest_paths": (setup_algorithm(shortest_paths), "random"),
+    "shortest_path": (setup_shortest_path, "grid"),
+    "span_tree": (setup_algorithm(span_tree), "grid"),
+    "span_tree_kruskal": (setup_algorithm(span_tree_kruskal), "scale_free"),
+    "topo_sort": (setup_algorithm(topo_sort), "layered_dag"),
+    "topo_sort_kahn": (setup_algorithm(topo_sort_kahn), "layered_dag"),
+    "array_heap": (setup_array_heap, None),
+    "array_stack": (setup_array_stack, None),
+    "linked_stack": (setup_linked_stack, None),
+}
+
+
+def measure(operation: str, n: int, seed: int, repeat: int,
+            memory: bool) -> dict:
+    """Returns the best time of repeat runs of an operation on size n,
+    and its peak traced memory if memory is True.
+    """
+    setup, generator = OPERATIONS[operation]
+    edges = GENERATORS[generator](n, seed=seed) if generator else []
+    run = setup(edges, n, seed)
+    seconds = None
+    for k in range(repeat):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        if seconds is None or elapsed < seconds:
+            seconds = elapsed
+    result = {"operation": operation, "graph": generator, "size": n,
+              "edges": len(edges), "seconds": seconds, "peak_bytes": None}
+    if memory:
+        tracemalloc.start()
+        run()
+        result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def compare(results: list, baseline: list, tolerance: float) -> list:
+    """Returns a message for each result that is more than tolerance
+    times slower than the baseline result for the same operation and
+    size.
+    """
+    base_times = {(result["operation"], result["size"]): result["seconds"]
+                  for result in baseline}
+    regressions = []
+    for result in results:
+        base = base_times.get((result["operation"], result["size"]))
+        if base is not None and base >= MIN_SECONDS:
+            ratio = result["seconds"] / base
+            if ratio > tolerance:
+                regressions.append(
+                    f"{result['operation']} n={result['size']}: "
+                    f"{result['seconds']:.4f}s vs {base:.4f}s "
+                    f"({ratio:.2f}x)")
+    return regressions
+
+
+def main(argv: list = None) -> int:
+    """Runs the benchmarks and returns the exit status: 1 if there
+    are regressions against the baseline, or 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(prog="python3 -m benchmarks",
+                                     description="Benchmark graph operations.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated vertex counts, up to 1000000")
+    parser.add_argument("--operations", default=",".join(OPERATIONS),
+                        help="comma-separated operations to run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per measurement; the best is kept")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the tracemalloc peak memory run")
+    parser.add_argument("--output", help="write the JSON results here")
+    parser.add_argument("--baseline", help="JSON results to compare with")
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="slowdown ratio that counts as a regression")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = []
+    for operation in args.operations.split(","):
+        if operation not in OPERATIONS:
+            parser.error(f"unknown operation {operation}")
+        for n in sizes:
+            result = measure(operation, n, args.seed, args.repeat,
+                             not args.no_memory)
+            results.append(result)
+            peak = result["peak_bytes"]
+            print(f"{operation:>16} n={n:<8} {result['seconds']:10.4f}s"
+                  + ("" if peak is None else f" {peak / 2**20:10.2f} MiB"),
+                  file=sys.stderr)
+    report = {"python": platform.python_version(), "seed": args.seed,
+              "results": results}
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=1)
+    else:
+        json.dump(report, sys.stdout, indent=1)
+        print()
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
@@ -0,0 +1,295 @@
+"""
+File: csrgraph.py
+
+This module defines a CSRGraph class, an immutable snapshot of a directed
+graph stored in compressed sparse row form, and a CSREdge class for the
+edges it reports. A snapshot can be shared with other processes through
+shared memory with CSRGraph.share and attach.
+"""
+
+from array import array
+from bisect import bisect_right
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable
+import edgewriter
+
+
+def weight_array(weights):
+    """Returns weights packed into an array of 64-bit integers or
+    doubles, or as a tuple if some weight is not a number.
+    """
+    typecode = 'q'
+    for weight in weights:
+        if type(weight) is float:
+            typecode = 'd'
+        elif type(weight) is not int:
+            return tuple(weights)
+    return array(typecode, weights)
+
+
+def attach(description):
+    """Returns a (block, graph) pair for a snapshot shared by 
+    CSRGraph.share, where graph reads its arrays directly from the 
+    shared memory block. Close the block once the graph is no longer 
+    used.
+    """
+    name, labels, offset_count, target_count, weights = description
+    block = SharedMemory(name=name)
+    stop = 8 * offset_count
+    offsets = block.buf[:stop].cast('q')
+    start, stop = stop, stop + 8 * target_count
+    targets = block.buf[start:stop].cast('q')
+    if type(weights) is str:
+        start, stop = stop, stop + 8 * target_count
+        weights = block.buf[start:stop].cast(weights)
+    return block, CSRGraph(labels, offsets, targets, weights)
+
+
+class CSREdge():
+    """Represents an edge reported by a CSRGraph."""
+
+    def __init__(self, from_label, to_label, weight):
+        self._src = from_label
+        self._dest = to_label
+        self._weight = weight
+
+    def __eq__(self, other) -> bool:
+        """Two edges are equal if they connect the same vertices."""
+        if self is other: return True
+        if type(self) != type(other): return False
+        return self._src == other._src and self._dest == other._dest
+
+    def __hash__(self):
+        """Returns the hash code of the edge."""
+        return hash((self._src, self._dest))
+
+    def get_from_vertex(self):
+        """Returns the label of the edge's source vertex."""
+        return self._src
+
+    def get_to_vertex(self):
+        """Returns the label of the edge's destination vertex."""
+        return self._dest
+
+    def get_weight(self):
+        """Returns the weight of the edge."""
+        return self._weight
+
+    def __str__(self):
+        """Returns the string representation of the edge."""
+        return f"{str(self._src)}>{str(self._dest)}:{str(self._weight)}"
+
+
+class CSRGraph():
+    """Represents an immutable directed graph. Vertices have dense
+    integer ids in 0..N-1. The edges leaving vertex i are stored at
+    positions offsets[i] to offsets[i + 1] - 1 of the targets and
+    weights arrays.
+    """
+
+    def __init__(self, labels, offsets, targets, weights):
+        self._labels = tuple(labels)
+        self._ids = {label: i for i, label in enumerate(self._labels)}
+        self._offsets = offsets
+        self._targets = targets
+        self._weights = weights
+        # The (offsets, sources, weights) arrays of the reversed edges,
+        # built when in_edges is first called
+        self._reverse = None
+        # A list holding the result of negative_edge once it is known
+        self._negative_edge = None
+
+    def __len__(self) -> int:
+        """Returns the number of vertices in the graph."""
+        return len(self._labels)
+
+    def size_edges(self) -> int:
+        """Returns the number of edges in the graph."""
+        return len(self._targets)
+
+    def size_vertices(self) -> int:
+        """Returns the number of vertices in the graph."""
+        return len(self)
+
+    def __str__(self) -> str:
+        """Returns the string representation of the graph."""
+        vertices = "".join(f" {str(label)}" for label in self._labels)
+        edges = "".join(f" {str(edge)}" for edge in self.edges())
+        return (f"{str(self.size_vertices())} Vertices: {vertices}\n"
+                f"{str(self.size_edges())} Edges: {edges}")
+
+    def __iter__(self):
+        """Supports iteration over the vertex labels."""
+        return iter(self._labels)
+
+    def freeze(self) -> 'CSRGraph':
+        """Returns self, which is already immutable."""
+        return self
+
+    def get_version(self) -> int:
+        """Returns 0, since the graph never changes."""
+        return 0
+
+    def contains_vertex(self, label) -> bool:
+        """Returns True if the graph contains a vertex with the given
+        label, or False otherwise.
+        """
+        return label in self._ids
+
+    def contains_edge(self, from_label, to_label) -> bool:
+        """Returns True if the graph contains an edge from a vertex with
+        from_label to a vertex with to_label, or False otherwise.
+        """
+        return self.get_edge(from_label, to_label) is not None
+
+    def get_edge(self, from_label, to_label):
+        """Returns the edge connecting the vertex with from_label to the
+        vertex with to_label, or None if no edge exists.
+        """
+        src = self._ids.get(from_label)
+        dest = self._ids.get(to_label)
+        if src is None or dest is None:
+            return None
+        for to_id, weight in self.out_edges(src):
+            if to_id == dest:
+                return self.edge_item(src, dest, weight)
+        return None
+
+    def edges(self, predicate=None) -> Iterable[CSREdge]:
+        """Returns an iterator over the edges in the graph, vertex by 
+        vertex. If predicate is given, only the edges for which it 
+        returns True are included.
+        """
+        for src in range(len(self)):
+            for dest, weight in self.out_edges(src):
+                edge = CSREdge(self._labels[src], self._labels[dest], weight)
+                if predicate is None or predicate(edge):
+                    yield edge
+
+    def iter_lines(self, tokens_per_line: int = edgewriter.TOKENS_PER_LINE):
+        """Returns an iterator over lines of up to tokens_per_line 
+        tokens in the src>dest:weight format read by create_graph.
+        """
+        return edgewriter.iter_lines(self, tokens_per_line)
+
+    def write_to(self, fp, start_label=None,
+                 tokens_per_line: int = edgewriter.TOKENS_PER_LINE):
+        """Streams the graph to the text file fp in the src>dest:weight
+        format, in buffered chunks. If start_label is given, it is 
+        written as the last line, which makes the output an edge file.
+        """
+        edgewriter.write_to(self, fp, start_label, tokens_per_line)
+
+    def share(self):
+        """Copies the arrays of the graph into a new shared memory block
+        and returns a (block, description) pair. The description can be
+        pickled and passed to attach in another process. The caller 
+        must close and unlink the block when it is no longer needed.
+        """
+        arrays = [self._offsets, self._targets]
+        weights = self._weights
+        if type(weights) is not tuple:
+            arrays.append(weights)
+            weights = memoryview(weights).format
+        data = [memoryview(values).cast('B') for values in arrays]
+        block = SharedMemory(create=True, size=max(1, sum(map(len, data))))
+        position = 0
+        for values in data:
+            block.buf[position:position + len(values)] = values
+            position += len(values)
+        description = (block.name, self._labels, len(self._offsets), 
+                       len(self._targets), weights)
+        return block, description
+
+    # Methods used by the algorithms module
+
+    def vertex_ids(self) -> Iterable[int]:
+        """Returns an iterator over the vertex ids."""
+        return iter(range(len(self)))
+
+    def id_bound(self) -> int:
+        """Returns one more than the largest vertex id."""
+        return len(self)
+
+    def id_of(self, label):
+        """Returns the id of the vertex with the given label,
+        or None if there is no such vertex.
+        """
+        return self._ids.get(label)
+
+    def label_of(self, vertex_id: int):
+        """Returns the label of the vertex with the given id."""
+        return self._labels[vertex_id]
+
+    def out_edges(self, vertex_id: int):
+        """Returns an iterator over (destination id, weight) pairs for
+        the edges leaving the vertex with the given id.
+        """
+        start = self._offsets[vertex_id]
+        stop = self._offsets[vertex_id + 1]
+        return zip(self._targets[start:stop], self._weights[start:stop])
+
+    def in_edges(self, vertex_id: int):
+        """Returns an iterator over (source id, weight) pairs for the
+        edges entering the vertex with the given id. The reversed edges
+        are arranged like the edges, in O(V + E) time, on first use.
+        """
+        if self._reverse is None:
+            self._reverse = self._reverse_arrays()
+        offsets, sources, weights = self._reverse
+        start = offsets[vertex_id]
+        stop = offsets[vertex_id + 1]
+        return zip(sources[start:stop], weights[start:stop])
+
+    def in_edge_view(self):
+        """Returns a function that maps a vertex id to an iterator of 
+        (source id, weight) pairs for the edges entering the vertex. 
+        The reversed edges are kept with the snapshot, which never 
+        changes.
+        """
+        return self.in_edges
+
+    def _reverse_arrays(self) -> tuple:
+        """Returns the offsets, sources and weights arrays of the graph
+        with every edge reversed.
+        """
+        n = len(self)
+        offsets = array('q', bytes(8 * (n + 1)))
+        for target in self._targets:
+            offsets[target + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        next_position = offsets[:-1]
+        sources = array('q', bytes(8 * len(self._targets)))
+        weights = [None] * len(self._targets)
+        for src in range(n):
+            for k in range(self._offsets[src], self._offsets[src + 1]):
+                position = next_position[self._targets[k]]
+                next_position[self._targets[k]] += 1
+                sources[position] = src
+                weights[position] = self._weights[k]
+        return offsets, sources, weight_array(weights)
+
+    def negative_edge(self):
+        """Returns a (from_id, to_id) pair for an edge with a negative 
+        weight, or None if every weight is 0 or more. The weights are 
+        scanned on first use only.
+        """
+        if self._negative_edge is None:
+            self._negative_edge = [None]
+            for position, weight in enumerate(self._weights):
+                if weight < 0:
+                    src = bisect_right(self._offsets, position) - 1
+                    self._negative_edge[0] = (src, self._targets[position])
+                    break
+        return self._negative_edge[0]
+
+    def vertex_item(self, vertex_id: int):
+        """Returns the label that algorithms report for a vertex."""
+        return self._labels[vertex_id]
+
+    def edge_item(self, from_id: int, to_id: int, weight):
+        """Returns the edge that algorithms report for the edge from
+        from_id to to_id with the given weight, which must exist.
+        """
+        return CSREdge(self._labels[from_id], self._labels[to_id], weight)
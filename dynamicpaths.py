@@ -0,0 +1,239 @@
+"""
+File: dynamicpaths.py
+
+This module defines a DynamicShortestPaths class, which keeps the
+single-source shortest paths of a LinkedDirectedGraph up to date as the
+graph changes.
+"""
+
+from algorithms import INFINITY, NegativeWeightError, shortest_paths
+from arrayheap import ArrayHeap
+
+INF = float("inf")
+
+
+class DynamicShortestPaths():
+    """Maintains the shortest paths from a start vertex in a graph with
+    non-negative weights. The paths are seeded from a shortest_paths
+    result and then repaired after each change to the graph, in the
+    style of Ramalingam and Reps: a shorter edge is propagated outward
+    from its destination, and a longer or removed tree edge recomputes
+    only the subtree of the shortest-path tree below it.
+
+    A change that gives an edge a negative weight makes the paths stop
+    following the graph. The change itself succeeds, and so do other 
+    listeners, but get_distance and get_results raise 
+    NegativeWeightError from then on, so a new object must be created
+    once the weights are non-negative again.
+    """
+
+    def __init__(self, graph, start_label, results: list = None):
+        """Seeds the paths from results, a grid returned by
+        shortest_paths(graph, start_label), or computes it if absent.
+        Raises NegativeWeightError if an edge has a negative weight.
+        """
+        negative = graph.negative_edge()
+        if negative is not None:
+            raise NegativeWeightError(graph.label_of(negative[0]),
+                                      graph.label_of(negative[1]))
+        self._graph = graph
+        self._start_label = start_label
+        # The (from_label, to_label) of the negative edge that stopped
+        # the paths from following the graph, or None
+        self._negative = None
+        self._seed(results)
+        graph.add_listener(self._on_change)
+
+    def close(self):
+        """Stops following changes to the graph."""
+        self._graph.remove_listener(self._on_change)
+
+    def get_distance(self, label):
+        """Returns the distance from the start vertex to the vertex with
+        the given label, or INFINITY if it is unreachable.
+        """
+        self._check_weights()
+        distance = self._distance[self._graph.get_vertex(label)]
+        return INFINITY if distance == INF else distance
+
+    def get_results(self) -> list[list]:
+        """Returns the paths as a grid in the format of shortest_paths.
+        Where several paths are equally short, the parent may differ
+        from the one shortest_paths would choose.
+        """
+        self._check_weights()
+        results = []
+        for vertex in self._graph.get_vertices():
+            distance = self._distance[vertex]
+            parent = self._parent.get(vertex)
+            results.append([vertex.get_label(),
+                            INFINITY if distance == INF else distance,
+                            None if parent is None else parent.get_label()])
+        return results
+
+    def _check_weights(self):
+        """Raises NegativeWeightError if the paths stopped following the
+        graph at a negative weight.
+        """
+        if self._negative is not None:
+            raise NegativeWeightError(*self._negative)
+
+    def _seed(self, results):
+        """Builds the distances, the shortest-path tree and the index of
+        edge sources from results, or from a new shortest_paths run.
+        """
+        graph = self._graph
+        if results is None:
+            results = shortest_paths(graph, self._start_label)
+        self._source = graph.get_vertex(self._start_label)
+        self._distance = {}
+        self._parent = {}
+        self._children = {}
+        self._sources = {vertex: set() for vertex in graph.get_vertices()}
+        for vertex in graph.get_vertices():
+            self._children[vertex] = set()
+            for edge in vertex.incident_edges():
+                self._sources[edge.get_to_vertex()].add(vertex)
+        for label, distance, parent_label in results:
+            vertex = graph.get_vertex(label)
+            self._distance[vertex] = INF if distance == INFINITY else distance
+            if parent_label is not None:
+                self._set_parent(vertex, graph.get_vertex(parent_label))
+
+    def _on_change(self, event, *args):
+        """Repairs the paths after a change to the graph."""
+        if self._negative is not None:
+            return
+        if (event in ("add_edge", "set_weight") and 
+                args[0].get_weight() < 0):
+            # Repairs assume weights of 0 or more, and would loop 
+            # forever around a negative cycle. Raising here would keep
+            # later listeners from hearing about the change.
+            edge = args[0]
+            self._negative = (edge._src.get_label(),
+                              edge.get_to_vertex().get_label())
+            return
+        if event == "add_vertex":
+            vertex = args[0]
+            self._distance[vertex] = INF
+            self._children[vertex] = set()
+            self._sources[vertex] = set()
+        elif event == "add_edge":
+            edge = args[0]
+            from_vertex = edge._src
+            self._sources[edge.get_to_vertex()].add(from_vertex)
+            self._decrease(from_vertex, edge.get_to_vertex(),
+                           edge.get_weight())
+        elif event == "set_weight":
+            edge, old_weight = args
+            from_vertex, to_vertex = edge._src, edge.get_to_vertex()
+            if edge.get_weight() < old_weight:
+                self._decrease(from_vertex, to_vertex, edge.get_weight())
+            elif (edge.get_weight() > old_weight and
+                  self._parent.get(to_vertex) is from_vertex):
+                self._increase([to_vertex])
+        elif event == "remove_edge":
+            from_vertex, to_vertex = args
+            self._sources[to_vertex].discard(from_vertex)
+            if self._parent.get(to_vertex) is from_vertex:
+                self._increase([to_vertex])
+        elif event == "remove_vertex":
+            self._remove_vertex(args[0])
+        elif event == "clear":
+            self._source = None
+            self._distance = {}
+            self._parent = {}
+            self._children = {}
+            self._sources = {}
+        else:
+            # A relabelled vertex changes its hash, so rebuild everything
+            if self._source is not None:
+                self._start_label = self._source.get_label()
+            self._seed(None)
+
+    def _set_parent(self, vertex, parent):
+        """Makes parent the parent of vertex in the shortest-path tree,
+        or detaches vertex from the tree if parent is None.
+        """
+        old_parent = self._parent.pop(vertex, None)
+        if old_parent is not None:
+            self._children[old_parent].discard(vertex)
+        if parent is not None:
+            self._parent[vertex] = parent
+            self._children[parent].add(vertex)
+
+    def _decrease(self, from_vertex, to_vertex, weight):
+        """Propagates a new or shorter edge from from_vertex to
+        to_vertex.
+        """
+        distance = self._distance[from_vertex] + weight
+        if distance < self._distance[to_vertex]:
+            self._distance[to_vertex] = distance
+            self._set_parent(to_vertex, from_vertex)
+            heap = ArrayHeap()
+            heap.add((distance, 0, to_vertex))
+            self._propagate(heap)
+
+    def _increase(self, roots: list):
+        """Recomputes the distances of the subtrees below roots after
+        the edges into them got longer or were removed.
+        """
+        affected = set()
+        pending = list(roots)
+        while pending:
+            vertex = pending.pop()
+            if vertex not in affected:
+                affected.add(vertex)
+                pending.extend(self._children[vertex])
+        for vertex in affected:
+            self._distance[vertex] = INF
+            self._set_parent(vertex, None)
+        # Reconnect each affected vertex through its best edge from an
+        # unaffected vertex, then settle the rest from there.
+        heap = ArrayHeap()
+        for vertex in affected:
+            best, best_parent = INF, None
+            for from_vertex in self._sources[vertex]:
+                if from_vertex not in affected:
+                    weight = from_vertex.get_edge_to(vertex).get_weight()
+                    distance = self._distance[from_vertex] + weight
+                    if distance < best:
+                        best, best_parent = distance, from_vertex
+            if best_parent is not None:
+                self._distance[vertex] = best
+                self._set_parent(vertex, best_parent)
+                heap.add((best, len(heap), vertex))
+        self._propagate(heap)
+
+    def _propagate(self, heap: ArrayHeap):
+        """Settles the vertices in heap in order of distance, relaxing
+        their outgoing edges. Heap entries are (distance, sequence,
+        vertex), and entries that are out of date are skipped.
+        """
+        sequence = len(heap)
+        while not heap.is_empty():
+            distance, order, vertex = heap.pop()
+            if distance > self._distance[vertex]:
+                continue
+            for edge in vertex.incident_edges():
+                to_vertex = edge.get_to_vertex()
+                new_distance = distance + edge.get_weight()
+                if new_distance < self._distance[to_vertex]:
+                    self._distance[to_vertex] = new_distance
+                    self._set_parent(to_vertex, vertex)
+                    heap.add((new_distance, sequence, to_vertex))
+                    sequence += 1
+
+    def _remove_vertex(self, vertex):
+        """Drops a removed vertex and recomputes the subtree below it."""
+        for edge in vertex.incident_edges():
+            self._sources[edge.get_to_vertex()].discard(vertex)
+        children = list(self._children.pop(vertex))
+        for child in children:
+            self._parent.pop(child)
+        self._set_parent(vertex, None)
+        del self._distance[vertex]
+        del self._sources[vertex]
+        if vertex is self._source:
+            self._source = None
+        self._increase(children)
@@ -0,0 +1,236 @@
+"""
+File: edgereader.py
+
+This module reads graphs from edge files as a pipeline of generators, so
+that only a bounded part of the file is in memory at once. An edge file
+holds tokens in the format source>destination:weight, where the weight
+is an integer or a decimal number, or a lone label for a disconnected
+vertex, separated by spaces and spread over any number of lines; its 
+last line is the label of the start vertex. Files
+ending in .gz, .bz2 or .xz are decompressed on the fly. Chunks of the
+file can be parsed on a pool of worker processes.
+"""
+
+import bz2
+import gzip
+import lzma
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+from math import isfinite
+from graph import LinkedDirectedGraph
+
+# Functions that open each kind of compressed file as text
+OPENERS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+
+# Integer weights must lie in [-WEIGHT_LIMIT, WEIGHT_LIMIT), so that 
+# they fit the int64 weight arrays of snapshots and graph files
+WEIGHT_LIMIT = 1 << 63
+
+
+def parse_token(token: str) -> tuple:
+    """Returns (from_label, to_label, weight) for an edge token, or
+    (label, None, None) for a disconnected vertex. Raises ValueError if
+    the token is malformed.
+    """
+    if not '>' in token:
+        return token, None, None
+    bracket_pos = token.find('>')
+    colon_pos = token.find(':')
+    if colon_pos == -1 or bracket_pos > colon_pos:
+        raise ValueError("Problem with > or :")
+    weight = parse_weight(token[colon_pos + 1 :])
+    return token[:bracket_pos], token[bracket_pos + 1 : colon_pos], weight
+
+
+def parse_weight(text: str):
+    """Returns text as an int if it is an integer, or as a float 
+    otherwise. Raises ValueError if text is not a finite number, or is
+    an integer that does not fit in 64 bits.
+    """
+    try:
+        weight = int(text)
+    except ValueError:
+        pass
+    else:
+        if not -WEIGHT_LIMIT <= weight < WEIGHT_LIMIT:
+            raise ValueError(f"Invalid weight {text}")
+        return weight
+    try:
+        weight = float(text)
+    except ValueError:
+        raise ValueError(f"Invalid weight {text}") from None
+    if not isfinite(weight):
+        raise ValueError(f"Invalid weight {text}")
+    return weight
+
+
+def open_edge_file(path: str):
+    """Opens the edge file at path as text, decompressing it if its
+    name ends in .gz, .bz2 or .xz.
+    """
+    for extension, opener in OPENERS.items():
+        if path.endswith(extension):
+            return opener(path, "rt")
+    return open(path)
+
+
+def read_chunks(file, chunk_size: int):
+    """Generates the text of file in chunks of chunk_size characters."""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def split_text(chunks):
+    """Generates (line_number, text) pairs from a stream of chunks, 
+    where text starts on line line_number and holds only whole tokens.
+    A token split across chunks is carried over to the next chunk, so a
+    long line is never copied more than once. Text without tokens is 
+    skipped.
+    """
+    number = 1
+    rest = ""
+    for chunk in chunks:
+        text = rest + chunk
+        end = _token_start(text, len(text))
+        rest = text[end:]
+        text = text[:end]
+        if text and not text.isspace():
+            yield number, text
+        number += text.count("\n")
+    if rest:
+        yield number, rest
+
+
+def _token_start(text: str, end: int) -> int:
+    """Returns the index where the run of non-whitespace characters 
+    that ends at index end of text starts.
+    """
+    start = end
+    while start > 0 and not text[start - 1].isspace():
+        start -= 1
+    return start
+
+
+def parse_text(piece: tuple) -> tuple[list, list]:
+    """Parses a (line_number, text) pair from split_text. Returns a 
+    list of (line_number, from_label, to_label, weight) records, in the
+    format of parse_token, and a list of (line_number, message) errors.
+    """
+    first, text = piece
+    records = []
+    errors = []
+    for number, line in enumerate(text.split("\n"), first):
+        for token in line.split():
+            try:
+                records.append((number,) + parse_token(token))
+            except ValueError as error:
+                errors.append((number, f"{error} in {token}"))
+    return records, errors
+
+
+def split_start_label(piece: tuple) -> tuple[tuple, str]:
+    """Splits the last token, the start label, off the last piece of an
+    edge file. Returns the rest of the piece and the label.
+    """
+    number, text = piece
+    text = text.rstrip()
+    start = _token_start(text, len(text))
+    return (number, text[:start]), text[start:]
+
+
+def parse_batches(pieces, workers: int):
+    """Generates the results of parse_text for each piece, in order.
+    If workers is more than 1, the pieces are parsed on a process pool
+    with a bounded number of pieces in flight.
+    """
+    if workers <= 1:
+        yield from map(parse_text, pieces)
+        return
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for piece in pieces:
+            pending.append(executor.submit(parse_text, piece))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def load_edge_file(path: str, workers: int = 1, chunk_size: int = 1 << 20,
+                   flyweight: bool = False) -> tuple:
+    """Reads the edge file at path in chunks of chunk_size characters
+    and returns a (graph, start_label, errors) tuple. The start label is
+    the last token of the file. Malformed tokens, duplicate vertices and
+    duplicate edges are skipped and reported in errors as (line_number,
+    message) pairs. With more than one worker, the chunks are parsed in
+    parallel before being merged into one LinkedDirectedGraph, which 
+    stores its edges as flyweights if flyweight is True.
+    """
+    graph = LinkedDirectedGraph(flyweight=flyweight)
+    # Parse errors and merge errors are kept apart, so that each line
+    # lists its parse errors first wherever the chunks split it
+    errors = []
+    merge_errors = []
+    start_label = [""]
+
+    def hold_back_label(pieces):
+        """Passes pieces through, splitting the start label off the 
+        last one.
+        """
+        previous = None
+        for piece in pieces:
+            if previous is not None:
+                yield previous
+            previous = piece
+        if previous is not None:
+            previous, start_label[0] = split_start_label(previous)
+            yield previous
+
+    with open_edge_file(path) as file:
+        pieces = hold_back_label(split_text(read_chunks(file, chunk_size)))
+        for records, piece_errors in parse_batches(pieces, workers):
+            errors.extend(piece_errors)
+            _merge(graph, records, merge_errors)
+    errors.extend(merge_errors)
+    errors.sort(key=lambda error: error[0])
+    return graph, start_label[0], errors
+
+
+def _merge(graph: LinkedDirectedGraph, records: list, errors: list):
+    """Adds parsed records to graph, appending a (line_number, message)
+    error to errors for each duplicate. Runs of edges are added in one
+    batch, which is resumed after the record of each duplicate edge.
+    """
+    for is_vertex, run in groupby(records, _is_vertex_record):
+        if is_vertex:
+            for number, label, to_label, weight in run:
+                if graph.contains_vertex(label):
+                    errors.append((number, f"Duplicate vertex {label}"))
+                else:
+                    graph.add_vertex(label)
+            continue
+        current = [None]
+
+        def edges():
+            """Generates the rest of the run as edges for the graph."""
+            for record in run:
+                current[0] = record
+                yield record[1:]
+
+        while True:
+            try:
+                graph.add_edges_from(edges())
+                break
+            except KeyError:
+                number, from_label, to_label, weight = current[0]
+                errors.append((number,
+                               f"Duplicate edge {from_label}>{to_label}"))
+
+
+def _is_vertex_record(record: tuple) -> bool:
+    """Returns True if a parsed record is a disconnected vertex."""
+    return record[2] is None
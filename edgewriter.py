@@ -0,0 +1,71 @@
+"""
+File: edgewriter.py
+
+This module writes graphs in the edge file format read by edgereader
+and by GraphDemoModel.create_graph: tokens in the format
+source>destination:weight, or a lone label for a disconnected vertex,
+separated by spaces. The text is produced as a stream of lines, so a
+large graph is never held in memory as one string. Works with any graph
+that provides the vertex_ids, label_of and out_edges methods used by the
+algorithms module.
+"""
+
+from itertools import islice
+
+# Tokens per line of output
+TOKENS_PER_LINE = 1000
+
+# Characters gathered before each write to the file
+BUFFER_SIZE = 1 << 16
+
+
+def iter_tokens(graph):
+    """Returns an iterator over the tokens of graph, vertex by vertex.
+    A vertex without edges to or from it is written as its label.
+    """
+    named = set()
+    for vertex in graph.vertex_ids():
+        for to_vertex, weight in graph.out_edges(vertex):
+            named.add(to_vertex)
+    for vertex in graph.vertex_ids():
+        label = graph.label_of(vertex)
+        has_edges = False
+        for to_vertex, weight in graph.out_edges(vertex):
+            has_edges = True
+            yield f"{label}>{graph.label_of(to_vertex)}:{weight}"
+        if not has_edges and vertex not in named:
+            yield str(label)
+
+
+def iter_lines(graph, tokens_per_line: int = TOKENS_PER_LINE):
+    """Returns an iterator over lines of up to tokens_per_line tokens
+    of graph, without line endings.
+    """
+    tokens = iter_tokens(graph)
+    while True:
+        line = " ".join(islice(tokens, tokens_per_line))
+        if line == "":
+            return
+        yield line
+
+
+def write_to(graph, fp, start_label=None,
+             tokens_per_line: int = TOKENS_PER_LINE,
+             buffer_size: int = BUFFER_SIZE):
+    """Writes the tokens of graph to the text file fp in chunks of
+    about buffer_size characters. If start_label is given, it is
+    written as the last line, which makes the output an edge file.
+    """
+    chunk = []
+    size = 0
+    for line in iter_lines(graph, tokens_per_line):
+        chunk.append(line)
+        chunk.append("\n")
+        size += len(line) + 1
+        if size >= buffer_size:
+            fp.write("".join(chunk))
+            chunk = []
+            size = 0
+    if start_label is not None:
+        chunk.append(f"{start_label}\n")
+    fp.write("".join(chunk))
@@ -1,11 +1,28 @@
 """
 File: graph.py
 
-Classes: LinkedEdge, LinkedVertex, LinkedDirectedGraph
+Classes: MarkEpochs, LinkedEdge, FlyweightEdge, LinkedVertex, FlyweightVertex,
+LinkedDirectedGraph
 """
 
 from abstractcollection import AbstractCollection
+from csrgraph import CSRGraph, weight_array
+from array import array
 from typing import Iterable
+import edgewriter
+import instrument
+
+
+class MarkEpochs():
+    """Holds the current mark generations shared by the vertices and
+    edges of a graph. A vertex or edge is marked when its mark equals
+    the current generation, so advancing a generation clears every 
+    mark of that kind at once.
+    """
+
+    def __init__(self):
+        self.vertex = 1
+        self.edge = 1
 
 
 class LinkedEdge():
@@ -13,23 +30,31 @@ class LinkedEdge():
     weight, and mark attribute.
     """
 
+    __slots__ = ("_src", "_dest", "_weight", "_mark")
+
     def __init__(self, from_vertex, to_vertex, weight=None):         
         self._src = from_vertex
         self._dest = to_vertex
         self._weight = weight 
-        self._mark = False
+        self._mark = 0
 
     def clear_mark(self):
         """Clears the mark on the edge."""
-        self._mark = False
+        self._mark = 0
 
     def set_mark(self):
         """Marks the edge."""
-        self._mark = True
+        self._mark = self._src._epochs.edge
     
     def set_weight(self, weight):
-        """Sets the weight on the edge to weight."""
-        self._weight = weight  
+        """Sets the weight on the edge to weight. The graph is notified
+        only while the edge is still in it.
+        """
+        old_weight = self._weight
+        self._weight = weight
+        graph = self._src._graph
+        if graph is not None and self._src._edges.get(self._dest) is self:
+            graph._changed("set_weight", self, old_weight)
 
     def __eq__(self, other) -> bool:
         """Two edges are equal if they connect the same vertices."""
@@ -72,7 +97,7 @@ class LinkedEdge():
     
     def is_marked(self) -> bool:
         """Returns True if the edge is marked, or False otherwise."""
-        return self._mark   
+        return self._mark == self._src._epochs.edge
           
     def __str__(self):
         """Returns the string representation of the edge."""
@@ -81,35 +106,65 @@ class LinkedEdge():
 
 class LinkedVertex():
     """Represents a vertex that has a label, list of incident edges,
-    and mark attribute.
+    and mark attribute. A vertex in a graph also has a small integer id
+    that is unique among the graph's vertices.
     """
 
-    def __init__(self, label):
+    __slots__ = ("_label", "_id", "_edges", "_sources", "_graph", "_epochs",
+                 "_mark")
+
+    def __init__(self, label, graph: 'LinkedDirectedGraph' = None):
         self._label = label
-        self._edge_list = list()
-        self._mark = False
+        # Assigned by the graph when the vertex is added
+        self._id = None
+        # Maps each destination vertex to its edge, in insertion order
+        self._edges = dict()
+        # The vertices with edges to self, as dictionary keys, if the
+        # graph keeps an in-edge index, or None otherwise
+        self._sources = (dict() if graph is not None and graph._in_edges 
+                         else None)
+        self._graph = graph
+        self._epochs = graph._epochs if graph is not None else MarkEpochs()
+        self._mark = 0
 
     def clear_mark(self):
         """Unmarks the vertex."""
-        self._mark = False
+        self._mark = 0
 
     def set_mark(self):
         """Marks the vertex."""
-        self._mark = True
+        self._mark = self._epochs.vertex
 
     def set_label(self, label, graph):
         """Sets the label of the vertex in graph to label."""
+        # Vertices hash by label, so edge indexes that use self as a key
+        # must be rebuilt once the label has changed.
+        if self._sources is not None:
+            sources = list(self._sources)
+        else:
+            sources = [vertex for vertex in graph.get_vertices()
+                       if self in vertex._edges]
         graph._vertices.pop(self._label, None)
         graph._vertices[label] = self
-        self._label = label          
+        self._label = label
+        for vertex in sources:
+            vertex._edges = dict(vertex._edges.items())
+        for vertex in self._edges:
+            if vertex._sources is not None:
+                vertex._sources = dict(vertex._sources.items())
+        graph._changed("set_label", self)
 
     def get_label(self):
         """Returns the label of the vertex."""
         return self._label
+
+    def get_id(self) -> int:
+        """Returns the id of the vertex in its graph."""
+        return self._id
     
     def is_marked(self) -> bool:
         """Returns True if the vertex is marked, or False otherwise."""
-        return self._mark
+        return self._mark == self._epochs.vertex
      
     def __str__(self):
         """Returns the string representation of the vertex."""
@@ -130,28 +185,35 @@ class LinkedVertex():
     def add_edge_to(self, to_vertex: 'LinkedVertex', weight):
         """Connects self with to_vertex with an edge."""
         edge = LinkedEdge(self, to_vertex, weight)
-        self._edge_list.append(edge)
+        self._edges[to_vertex] = edge
+        if to_vertex._sources is not None:
+            to_vertex._sources[self] = None
     
     def get_edge_to(self, to_vertex: 'LinkedVertex'):
         """Returns the connecting edge if it exists, 
         or None otherwise.
         """
-        edge = LinkedEdge(self, to_vertex)
-        try:
-            return self._edge_list[self._edge_list.index(edge)]
-        except:
-            return None
+        if instrument.active is not None:
+            instrument.active.edge_lookups += 1
+        return self._edges.get(to_vertex)
 
-    def incident_edges(self) -> Iterable[list]:
+    def incident_edges(self) -> Iterable[LinkedEdge]:
         """Returns an iterator over the incident edges of the vertex."""
-        return iter(self._edge_list)
+        return iter(self._edges.values())
+
+    def out_edges(self):
+        """Returns an iterator over (destination id, weight) pairs for 
+        the incident edges of the vertex.
+        """
+        return ((edge._dest._id, edge._weight) 
+                for edge in self._edges.values())
         
     def neighboring_vertices(self) -> Iterable[list]:
         """Returns an iterator over the neighboring vertices of the 
         vertex.
         """
         vertices = list()
-        for edge in self._edge_list:
+        for edge in self._edges.values():
             vertices.append(edge.get_other_vertex(self))
         return iter(vertices)
             
@@ -159,40 +221,235 @@ class LinkedVertex():
         """Returns True if the edge exists and is removed, 
         or False otherwise.
         """
-        edge = LinkedEdge(self, to_vertex)
-        if edge in self._edge_list:
-            self._edge_list.remove(edge)
-            return True
-        else:
+        if self._edges.pop(to_vertex, None) is None:
             return False
+        if to_vertex._sources is not None:
+            to_vertex._sources.pop(self, None)
+        return True
+
+    def predecessors(self) -> Iterable['LinkedVertex']:
+        """Returns an iterator over the vertices that have edges to the
+        vertex. Requires an in-edge index.
+        """
+        return iter(list(self._sources))
+
+    def in_degree(self) -> int:
+        """Returns the number of edges to the vertex. Requires an 
+        in-edge index.
+        """
+        return len(self._sources)
+
+    def in_edges(self):
+        """Returns an iterator over (source id, weight) pairs for the 
+        edges to the vertex. Requires an in-edge index.
+        """
+        return ((source._id, source._edges[self]._weight) 
+                for source in self._sources)
+
+
+class FlyweightEdge(LinkedEdge):
+    """Represents an edge of a FlyweightVertex. The vertex stores only
+    the weight of the edge, so edge objects are created on demand and
+    write weight and mark changes back to the vertex.
+    """
+
+    __slots__ = ()
+
+    def clear_mark(self):
+        """Clears the mark on the edge."""
+        if self._src._edge_marks is not None:
+            self._src._edge_marks.pop(self._dest, None)
+
+    def set_mark(self):
+        """Marks the edge."""
+        if self._src._edge_marks is None:
+            self._src._edge_marks = dict()
+        self._src._edge_marks[self._dest] = self._src._epochs.edge
+
+    def set_weight(self, weight):
+        """Sets the weight on the edge to weight. The old weight is read
+        from the vertex, since another edge object for the same edge may
+        have changed it since this one was created. An edge that has 
+        been removed from the graph only changes its own weight.
+        """
+        self._weight = weight
+        edges = self._src._edges
+        if self._dest not in edges:
+            return
+        old_weight = edges[self._dest]
+        edges[self._dest] = weight
+        graph = self._src._graph
+        if graph is not None:
+            graph._changed("set_weight", self, old_weight)
+
+    def is_marked(self) -> bool:
+        """Returns True if the edge is marked, or False otherwise."""
+        marks = self._src._edge_marks
+        return (marks is not None and 
+                marks.get(self._dest) == self._src._epochs.edge)
+
+
+class FlyweightVertex(LinkedVertex):
+    """Represents a vertex that stores the destination and weight of 
+    each incident edge instead of an edge object, which roughly halves 
+    the memory per edge. Edges are created as FlyweightEdge objects when
+    they are asked for. Edge marks are kept in a dictionary of their own
+    that is created when the first edge is marked.
+    """
+
+    __slots__ = ("_edge_marks",)
+
+    def __init__(self, label, graph: 'LinkedDirectedGraph' = None):
+        # _edges maps each destination vertex to the weight of its edge
+        LinkedVertex.__init__(self, label, graph)
+        self._edge_marks = None
+
+    def add_edge_to(self, to_vertex: 'LinkedVertex', weight):
+        """Connects self with to_vertex with an edge."""
+        self._edges[to_vertex] = weight
+        if self._edge_marks is not None:
+            self._edge_marks.pop(to_vertex, None)
+        if to_vertex._sources is not None:
+            to_vertex._sources[self] = None
+
+    def get_edge_to(self, to_vertex: 'LinkedVertex'):
+        """Returns the connecting edge if it exists, 
+        or None otherwise.
+        """
+        if instrument.active is not None:
+            instrument.active.edge_lookups += 1
+        if to_vertex not in self._edges:
+            return None
+        return FlyweightEdge(self, to_vertex, self._edges[to_vertex])
+
+    def incident_edges(self) -> Iterable[LinkedEdge]:
+        """Returns an iterator over the incident edges of the vertex."""
+        return (FlyweightEdge(self, to_vertex, weight)
+                for to_vertex, weight in self._edges.items())
+
+    def out_edges(self):
+        """Returns an iterator over (destination id, weight) pairs for 
+        the incident edges of the vertex.
+        """
+        return ((to_vertex._id, weight) 
+                for to_vertex, weight in self._edges.items())
+
+    def in_edges(self):
+        """Returns an iterator over (source id, weight) pairs for the 
+        edges to the vertex. Requires an in-edge index.
+        """
+        return ((source._id, source._edges[self]) 
+                for source in self._sources)
+
+    def neighboring_vertices(self) -> Iterable[list]:
+        """Returns an iterator over the neighboring vertices of the 
+        vertex.
+        """
+        return iter(list(self._edges))
+
+    def remove_edge_to(self, to_vertex: 'LinkedVertex') -> bool:
+        """Returns True if the edge exists and is removed, 
+        or False otherwise.
+        """
+        if to_vertex not in self._edges:
+            return False
+        del self._edges[to_vertex]
+        if self._edge_marks is not None:
+            self._edge_marks.pop(to_vertex, None)
+        if to_vertex._sources is not None:
+            to_vertex._sources.pop(self, None)
+        return True
 
 
 class LinkedDirectedGraph(AbstractCollection):
     """Represents a directed graph using an adjacency list. Accepts an
     optional collection of labels as an argument and adds vertices with
-    these labels.
+    these labels. If flyweight is True, the vertices are FlyweightVertex
+    objects, which create edge objects only when they are asked for. If
+    in_edges is True, each vertex also keeps an index of the vertices
+    with edges to it, so removing a vertex takes time proportional to 
+    its degree instead of to the size of the graph, and predecessors and
+    in_degree take time proportional to the in-degree. Without it, a 
+    single-target shortest path query gathers the reversed edges for 
+    itself. The index is only kept when asked for, with in_edges or 
+    index_in_edges, since it costs memory per edge and time on every 
+    change.
     """
 
-    def __init__(self, source_collection=None):
+    def __init__(self, source_collection=None, flyweight: bool = False,
+                 in_edges: bool = False):
+        self._vertex_type = FlyweightVertex if flyweight else LinkedVertex
+        self._in_edges = in_edges
         self._edge_count = 0
         self._vertices = {}
+        # The vertex with each id, or None for ids in the free list
+        self._by_id = []
+        self._free_ids = []
+        self._epochs = MarkEpochs()
+        self._version = 0
+        # The (version, result) of the last call to negative_edge
+        self._negative_edge = (None, None)
+        # The (version, function) of the last call to in_edge_view
+        self._in_edge_view = (None, None)
+        self._listeners = []
         AbstractCollection.__init__(self, source_collection)
 
     def clear(self):
         """Removes all the vertices from the graph."""
+        for vertex in self._vertices.values():
+            vertex._graph = None
         self._size = 0
         self._edge_count = 0
-        self._vertices = {}        
+        self._vertices = {}
+        self._by_id = []
+        self._free_ids = []
+        self._changed("clear")
+
+    def get_version(self) -> int:
+        """Returns a counter that changes whenever the graph does."""
+        return self._version
+
+    def add_listener(self, listener):
+        """Registers listener to be called as listener(event, *args) 
+        after each change to the graph. The events and their arguments 
+        are add_vertex (vertex), remove_vertex (vertex), add_edge 
+        (edge), remove_edge (from_vertex, to_vertex), set_weight (edge,
+        old_weight), set_label (vertex) and clear ().
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Unregisters a listener added by add_listener."""
+        self._listeners.remove(listener)
+
+    def _changed(self, event, *args):
+        """Records a change to the vertices, edges or weights and 
+        notifies the listeners.
+        """
+        self._version += 1
+        for listener in self._listeners:
+            listener(event, *args)
+
+    def index_in_edges(self):
+        """Starts keeping an in-edge index, building it in O(V + E) 
+        time, if the graph does not keep one yet.
+        """
+        if self._in_edges:
+            return
+        self._in_edges = True
+        for vertex in self.get_vertices():
+            vertex._sources = dict()
+        for vertex in self.get_vertices():
+            for to_vertex in vertex._edges:
+                to_vertex._sources[vertex] = None
 
     def clear_edge_marks(self):
-        """Clears all edge marks."""
-        for edge in self.edges():
-            edge.clear_mark()
+        """Clears all edge marks in constant time."""
+        self._epochs.edge += 1
     
     def clear_vertex_marks(self):
-        """Clears all vertex marks."""
-        for vertex in self.get_vertices():
-            vertex.clear_mark()
+        """Clears all vertex marks in constant time."""
+        self._epochs.vertex += 1
     
     def size_edges(self) -> int:
         """Returns the number of edges in the graph."""
@@ -204,26 +461,54 @@ class LinkedDirectedGraph(AbstractCollection):
     
     def __str__(self) -> str:
         """Returns the string representation of the graph."""
-        result = f"{str(self.size_vertices())} Vertices: "
-        for vertex in self._vertices:
-            result += f" {str(vertex)}"
-        result += "\n"
-        result += f"{str(self.size_edges())} Edges: "
-        for edge in self.edges():
-            result += f" {str(edge)}"
-        return result
+        vertices = "".join(f" {str(vertex)}" for vertex in self._vertices)
+        edges = "".join(f" {str(edge)}" for edge in self.edges())
+        return (f"{str(self.size_vertices())} Vertices: {vertices}\n"
+                f"{str(self.size_edges())} Edges: {edges}")
 
     def add(self, label):
         """For compatibility with other collections."""
         self.add_vertex(label)
 
+    def freeze(self) -> CSRGraph:
+        """Returns an immutable CSRGraph snapshot of the graph. Vertex 
+        ids follow the order of get_vertices().
+        """
+        ids = array('q', bytes(8 * len(self._by_id)))
+        for i, vertex in enumerate(self.get_vertices()):
+            ids[vertex._id] = i
+        offsets = array('q', [0])
+        targets = array('q')
+        weights = []
+        for vertex in self.get_vertices():
+            for to_id, weight in vertex.out_edges():
+                targets.append(ids[to_id])
+                weights.append(weight)
+            offsets.append(len(targets))
+        return CSRGraph(self._vertices.keys(), offsets, targets, 
+                        weight_array(weights))
+
     # Vertex-related methods
     
     def add_vertex(self, label):
         """Adds a vertex with the given label to the graph."""
-        self._vertices[label] = LinkedVertex(label)
+        vertex = self._vertex_type(label, self)
+        self._assign_id(vertex)
+        self._vertices[label] = vertex
         self._size += 1
+        self._changed("add_vertex", vertex)
         
+    def _assign_id(self, vertex: LinkedVertex):
+        """Gives vertex the most recently freed id, or the next new id
+        if none is free.
+        """
+        if self._free_ids:
+            vertex._id = self._free_ids.pop()
+            self._by_id[vertex._id] = vertex
+        else:
+            vertex._id = len(self._by_id)
+            self._by_id.append(vertex)
+
     def contains_vertex (self, label) -> bool:
         """Returns True if the graph contains a vertex with the given
         label, or False otherwise.
@@ -245,16 +530,30 @@ class LinkedDirectedGraph(AbstractCollection):
         if removed_vertex is None: 
             return False
         
-        """Examine all other vertices to remove edges directed at the 
-        removed vertex"""
-        for vertex in self.get_vertices():
-            if vertex.remove_edge_to(removed_vertex): 
-                self._edge_count -= 1
+        if removed_vertex._sources is not None:
+            # The in-edge index lists the vertices with edges to the
+            # removed vertex. A self-loop is counted with the out-edges.
+            for vertex in removed_vertex.predecessors():
+                if (vertex is not removed_vertex and 
+                        vertex.remove_edge_to(removed_vertex)):
+                    self._edge_count -= 1
+            for vertex in removed_vertex._edges:
+                vertex._sources.pop(removed_vertex, None)
+        else:
+            """Examine all other vertices to remove edges directed at the 
+            removed vertex"""
+            for vertex in self.get_vertices():
+                if vertex.remove_edge_to(removed_vertex): 
+                    self._edge_count -= 1
 
         # Examine all edges from the removed vertex to others
-        for edge in removed_vertex.incident_edges():
-            self._edge_count -= 1           
+        self._edge_count -= len(removed_vertex._edges)
+        self._by_id[removed_vertex._id] = None
+        self._free_ids.append(removed_vertex._id)
         self._size -= 1
+        self._changed("remove_vertex", removed_vertex)
+        # Edge objects kept from the removed vertex no longer notify
+        removed_vertex._graph = None
         return True
     
     # Edge-related methods
@@ -267,6 +566,7 @@ class LinkedDirectedGraph(AbstractCollection):
         to_vertex   = self.get_vertex(to_label)
         from_vertex.add_edge_to(to_vertex, weight)
         self._edge_count += 1
+        self._changed("add_edge", from_vertex.get_edge_to(to_vertex))
     
     def contains_edge(self, from_label, to_label) -> bool:
         """Returns True if the graph contains an edge with given weight 
@@ -293,22 +593,120 @@ class LinkedDirectedGraph(AbstractCollection):
         to_vertex   = self.get_vertex(to_label)     
         edge_removed_flg = from_vertex.remove_edge_to(to_vertex)
         if edge_removed_flg: 
-            self._edgeCount -= 1
+            self._edge_count -= 1
+            self._changed("remove_edge", from_vertex, to_vertex)
         return edge_removed_flg
 
+    def add_edges_from(self, edges) -> int:
+        """Adds an edge for each (from_label, to_label, weight) triple 
+        in edges, adding the vertices that are not yet in the graph, and
+        returns the number of edges added. Raises KeyError if an edge is
+        already in the graph, after adding the edges before it.
+        """
+        if self._listeners:
+            # Listeners expect one event per change, with the counts up 
+            # to date
+            return self._add_edges_one_by_one(edges)
+        vertices = self._vertices
+        vertex_type = self._vertex_type
+        vertex_count = len(vertices)
+        edge_count = 0
+        try:
+            for from_label, to_label, weight in edges:
+                # Each label is looked up once, and the dictionary of a 
+                # vertex's edges doubles as the set of its (from, to) 
+                # pairs for finding duplicates.
+                from_vertex = vertices.get(from_label)
+                if from_vertex is None:
+                    from_vertex = vertex_type(from_label, self)
+                    self._assign_id(from_vertex)
+                    vertices[from_label] = from_vertex
+                to_vertex = vertices.get(to_label)
+                if to_vertex is None:
+                    to_vertex = vertex_type(to_label, self)
+                    self._assign_id(to_vertex)
+                    vertices[to_label] = to_vertex
+                if to_vertex in from_vertex._edges:
+                    raise KeyError(f"Duplicate edge {from_label}>{to_label}")
+                from_vertex.add_edge_to(to_vertex, weight)
+                edge_count += 1
+        finally:
+            if edge_count or len(vertices) > vertex_count:
+                self._size += len(vertices) - vertex_count
+                self._edge_count += edge_count
+                self._version += 1
+        return edge_count
+
+    def _add_edges_one_by_one(self, edges) -> int:
+        """Adds edges like add_edges_from, notifying the listeners of
+        each change.
+        """
+        edge_count = 0
+        for from_label, to_label, weight in edges:
+            for label in (from_label, to_label):
+                if not self.contains_vertex(label):
+                    self.add_vertex(label)
+            if self.contains_edge(from_label, to_label):
+                raise KeyError(f"Duplicate edge {from_label}>{to_label}")
+            self.add_edge(from_label, to_label, weight)
+            edge_count += 1
+        return edge_count
+
+    def remove_edges_from(self, edges) -> int:
+        """Removes the edge for each (from_label, to_label) pair in 
+        edges, ignoring any further items such as weights, and returns 
+        the number of edges removed. Pairs without an edge are skipped.
+        """
+        vertices = self._vertices
+        notify = bool(self._listeners)
+        edge_count = 0
+        try:
+            for edge in edges:
+                from_vertex = vertices.get(edge[0])
+                to_vertex = vertices.get(edge[1])
+                if (from_vertex is None or to_vertex is None or 
+                        not from_vertex.remove_edge_to(to_vertex)):
+                    continue
+                edge_count += 1
+                if notify:
+                    self._edge_count -= 1
+                    self._changed("remove_edge", from_vertex, to_vertex)
+        finally:
+            if edge_count and not notify:
+                self._edge_count -= edge_count
+                self._version += 1
+        return edge_count
+
     # Iterators
     
     def __iter__(self):
         """Supports iteration over a view of self (the vertices)."""
         return self.get_vertices()
 
-    def edges(self) -> Iterable[set]:
-        """Returns an iterator over the edges in the graph."""
-        result = set()
+    def edges(self, predicate=None) -> Iterable[LinkedEdge]:
+        """Returns an iterator over the edges in the graph, vertex by 
+        vertex. If predicate is given, only the edges for which it 
+        returns True are included, e.g. edges(LinkedEdge.is_marked).
+        """
         for vertex in self.get_vertices():
-            edges = vertex.incident_edges()
-            result = result.union(set(edges))
-        return iter(result)
+            if predicate is None:
+                yield from vertex.incident_edges()
+            else:
+                yield from filter(predicate, vertex.incident_edges())
+
+    def iter_lines(self, tokens_per_line: int = edgewriter.TOKENS_PER_LINE):
+        """Returns an iterator over lines of up to tokens_per_line 
+        tokens in the src>dest:weight format read by create_graph.
+        """
+        return edgewriter.iter_lines(self, tokens_per_line)
+
+    def write_to(self, fp, start_label=None,
+                 tokens_per_line: int = edgewriter.TOKENS_PER_LINE):
+        """Streams the graph to the text file fp in the src>dest:weight
+        format, in buffered chunks. If start_label is given, it is 
+        written as the last line, which makes the output an edge file.
+        """
+        edgewriter.write_to(self, fp, start_label, tokens_per_line)
     
     def get_vertices(self) -> Iterable[LinkedVertex]:
         """Returns an iterator over the vertices in the graph."""
@@ -324,4 +722,113 @@ class LinkedDirectedGraph(AbstractCollection):
         """Returns an iterator over the neighboring vertices of the
         vertex with given label.
         """
-        return self.get_vertex(label).neighboring_vertices()
\ No newline at end of file
+        return self.get_vertex(label).neighboring_vertices()
+
+    def predecessors(self, label):
+        """Returns an iterator over the vertices with edges to the 
+        vertex with given label. Without an in-edge index, every vertex
+        is examined.
+        """
+        vertex = self.get_vertex(label)
+        if vertex._sources is not None:
+            return vertex.predecessors()
+        return iter([source for source in self.get_vertices()
+                     if vertex in source._edges])
+
+    def in_degree(self, label) -> int:
+        """Returns the number of edges to the vertex with given label.
+        Without an in-edge index, every vertex is examined.
+        """
+        vertex = self.get_vertex(label)
+        if vertex._sources is not None:
+            return vertex.in_degree()
+        return sum(vertex in source._edges for source in self.get_vertices())
+
+    # Methods used by the algorithms module. A linked graph identifies
+    # each vertex by the id it was given when it was added, so that the
+    # algorithms can keep their state in lists indexed by id.
+
+    def vertex_ids(self) -> Iterable[int]:
+        """Returns an iterator over the vertex ids."""
+        return (vertex._id for vertex in self._vertices.values())
+
+    def id_bound(self) -> int:
+        """Returns one more than the largest vertex id."""
+        return len(self._by_id)
+
+    def id_of(self, label) -> int:
+        """Returns the id of the vertex with the given label,
+        or None if there is no such vertex.
+        """
+        vertex = self._vertices.get(label)
+        return None if vertex is None else vertex._id
+
+    def label_of(self, vertex_id: int):
+        """Returns the label of the vertex with the given id."""
+        return self._by_id[vertex_id]._label
+
+    def out_edges(self, vertex_id: int):
+        """Returns an iterator over (destination id, weight) pairs for
+        the edges leaving the vertex with the given id.
+        """
+        return self._by_id[vertex_id].out_edges()
+
+    def in_edges(self, vertex_id: int):
+        """Returns an iterator over (source id, weight) pairs for the
+        edges entering the vertex with the given id. Without an in-edge
+        index, every vertex is examined; the index is never built here,
+        since keeping it costs memory and time on every later change.
+        """
+        vertex = self._by_id[vertex_id]
+        if vertex._sources is not None:
+            return vertex.in_edges()
+        return iter([(source._id, source.get_edge_to(vertex).get_weight())
+                     for source in self.get_vertices()
+                     if vertex in source._edges])
+
+    def in_edge_view(self):
+        """Returns a function that maps a vertex id to a list or 
+        iterator of (source id, weight) pairs for the edges entering the
+        vertex, for use until the graph changes. Without an in-edge 
+        index, the reversed edges are gathered in O(V + E) time into 
+        lists, which are reused by later queries and gathered again 
+        only after the graph has changed. The graph is left unindexed,
+        so changes pay nothing for them.
+        """
+        if self._in_edges:
+            return self.in_edges
+        version, view = self._in_edge_view
+        if version != self._version:
+            sources = [[] for vertex in self._by_id]
+            for vertex in self.get_vertices():
+                for to_id, weight in vertex.out_edges():
+                    sources[to_id].append((vertex._id, weight))
+            view = sources.__getitem__
+            self._in_edge_view = (self._version, view)
+        return view
+
+    def negative_edge(self):
+        """Returns a (from_id, to_id) pair for an edge with a negative 
+        weight, or None if every weight is 0 or more. The edges are 
+        scanned again only after the graph has changed.
+        """
+        version, result = self._negative_edge
+        if version != self._version:
+            result = next(((vertex._id, to_id) 
+                           for vertex in self._vertices.values()
+                           for to_id, weight in vertex.out_edges()
+                           if weight < 0), None)
+            self._negative_edge = (self._version, result)
+        return result
+
+    def vertex_item(self, vertex_id: int) -> LinkedVertex:
+        """Returns the vertex that algorithms report for an id."""
+        return self._by_id[vertex_id]
+
+    def edge_item(self, from_id: int, to_id: int, weight):
+        """Returns the edge that algorithms report for the edge from
+        the vertex with id from_id to the vertex with id to_id, which 
+        must exist. The weight is the one the algorithm found for it, 
+        and is not needed to look the edge up.
+        """
+        return self._by_id[from_id].get_edge_to(self._by_id[to_id])
\ No newline at end of file
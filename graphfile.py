@@ -0,0 +1,101 @@
+"""
+File: graphfile.py
+
+This module saves graphs in a binary file format and loads them back as
+CSRGraph snapshots that read their arrays straight from a memory-mapped
+file. Numbers are stored in the machine's native byte order, and every
+section starts on an 8-byte boundary:
+
+    header   magic b"GRPH", format version (uint32), vertex count N
+             (uint64), edge count M (uint64), weight typecode b"q" for
+             int64 or b"d" for float64, and 7 bytes of padding
+    labels   N + 1 uint64 offsets into a UTF-8 blob, then the blob
+    offsets  N + 1 int64 CSR row offsets
+    targets  M int64 destination ids
+    weights  M int64 or float64 weights
+"""
+
+import mmap
+import struct
+from array import array
+from csrgraph import CSRGraph
+
+MAGIC = b"GRPH"
+VERSION = 1
+HEADER = struct.Struct("=4sIQQc7x")
+
+
+def is_graph_file(path: str) -> bool:
+    """Returns True if the file at path starts like a binary graph
+    file, or False otherwise.
+    """
+    with open(path, "rb") as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def save_graph(graph, path: str):
+    """Writes graph, a LinkedDirectedGraph or CSRGraph, to a binary
+    graph file at path. Raises ValueError if a label is not a string
+    or a weight is not a number.
+    """
+    snapshot = graph if isinstance(graph, CSRGraph) else graph.freeze()
+    labels = [snapshot.label_of(vertex) for vertex in snapshot.vertex_ids()]
+    if not all(type(label) is str for label in labels):
+        raise ValueError("Labels must be strings")
+    weights = snapshot._weights
+    if type(weights) is tuple:
+        raise ValueError("Weights must be numbers")
+    typecode = memoryview(weights).format
+    encoded = [label.encode("utf-8") for label in labels]
+    label_offsets = array('Q', [0])
+    for label in encoded:
+        label_offsets.append(label_offsets[-1] + len(label))
+    blob = b"".join(encoded)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(labels),
+                               snapshot.size_edges(), typecode.encode()))
+        for values in (label_offsets, blob, snapshot._offsets,
+                       snapshot._targets, weights):
+            _write_aligned(file, values)
+
+
+def load_graph(path: str) -> CSRGraph:
+    """Returns a CSRGraph whose offset, target and weight arrays are
+    views of the memory-mapped file at path, so they are not copied
+    and processes that load the same file share its pages. Raises
+    ValueError if the file is not a binary graph file.
+    """
+    with open(path, "rb") as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(data) < HEADER.size:
+        raise ValueError("Not a graph file")
+    magic, version, n, m, typecode = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a graph file")
+    buffer = memoryview(data)
+    position = HEADER.size
+    label_offsets, position = _read_aligned(buffer, position, 'Q', n + 1)
+    blob, position = _read_aligned(buffer, position, 'B', label_offsets[-1])
+    labels = [str(blob[label_offsets[i]:label_offsets[i + 1]], "utf-8")
+              for i in range(n)]
+    offsets, position = _read_aligned(buffer, position, 'q', n + 1)
+    targets, position = _read_aligned(buffer, position, 'q', m)
+    weights, position = _read_aligned(buffer, position, typecode.decode(), m)
+    return CSRGraph(labels, offsets, targets, weights)
+
+
+def _write_aligned(file, values):
+    """Writes the bytes of values, padded to a multiple of 8."""
+    data = memoryview(values).cast('B')
+    file.write(data)
+    file.write(bytes(-len(data) % 8))
+
+
+def _read_aligned(buffer: memoryview, position: int, typecode: str,
+                  count: int):
+    """Returns a view of count items of the given typecode at position
+    in buffer, and the position of the next 8-byte boundary after them.
+    """
+    stop = position + count * struct.calcsize(typecode)
+    values = buffer[position:stop].cast(typecode)
+    return values, stop + (-stop % 8)
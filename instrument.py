@@ -0,0 +1,87 @@
+"""
+File: instrument.py
+
+This module provides opt-in counters and phase timers for the hot paths
+of the graph algorithms. While no run is being instrumented, active is
+None and each hot path pays for a single None check. Only one run per
+process should be instrumented at a time.
+"""
+
+import time
+
+# The statistics of the run being instrumented, or None when disabled
+active = None
+
+
+class RunStats():
+    """Holds the work counts and phase times of one algorithm run.
+    edges_relaxed counts every edge examined while relaxing distances
+    or growing a tree, and edge_lookups counts calls to get_edge_to.
+    """
+
+    def __init__(self):
+        self.heap_pushes = 0
+        self.heap_pops = 0
+        self.edges_relaxed = 0
+        self.vertices_visited = 0
+        self.edge_lookups = 0
+        self.phases = {}
+        self.total_seconds = 0.0
+
+    def as_dict(self) -> dict:
+        """Returns the statistics as a dictionary."""
+        return {"heap_pushes": self.heap_pushes,
+                "heap_pops": self.heap_pops,
+                "edges_relaxed": self.edges_relaxed,
+                "vertices_visited": self.vertices_visited,
+                "edge_lookups": self.edge_lookups,
+                "phases": dict(self.phases),
+                "total_seconds": self.total_seconds}
+
+    def __str__(self) -> str:
+        """Returns the statistics as one line per item."""
+        lines = [f"{name}: {value}" for name, value in self.as_dict().items()
+                 if name != "phases"]
+        lines.extend(f"phase {name}: {seconds:.6f}s"
+                     for name, seconds in self.phases.items())
+        return "\n".join(lines)
+
+
+def start() -> RunStats:
+    """Starts instrumenting a run and returns its statistics."""
+    global active
+    active = RunStats()
+    active.total_seconds = -time.perf_counter()
+    return active
+
+
+def stop() -> RunStats:
+    """Stops instrumenting and returns the statistics of the run."""
+    global active
+    stats = active
+    active = None
+    if stats is not None:
+        stats.total_seconds += time.perf_counter()
+    return stats
+
+
+class phase():
+    """A context manager that adds the time spent in its block to the
+    named phase of the active run, if there is one.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._start = None
+
+    def __enter__(self):
+        if active is not None:
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._start is not None and active is not None:
+            elapsed = time.perf_counter() - self._start
+            active.phases[self._name] = (active.phases.get(self._name, 0.0)
+                                         + elapsed)
+        return False
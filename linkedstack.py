@@ -30,16 +30,16 @@ class LinkedStack(AbstractStack):
         return self._items.data
 
     def __iter__(self) -> Iterable[list]:
-        """Supports iteration over a view of self."""
-        
-        def visit_nodes(node: Node):
-            """Adds items to temp_list from tail to head."""
-            if node is not None:
-                visit_nodes(node.next)
-                temp_list.append(node.data)
-                
-        temp_list = list()                
-        visit_nodes(self._items)
+        """Supports iteration over a view of self, from bottom to top.
+        The nodes are walked in a loop, from top to bottom, so that 
+        deep stacks do not exhaust the recursion limit.
+        """
+        temp_list = list()
+        node = self._items
+        while node is not None:
+            temp_list.append(node.data)
+            node = node.next
+        temp_list.reverse()
         return iter(temp_list)
 
     def clear(self):
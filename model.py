@@ -6,6 +6,37 @@ algorithms.
 """
 
 from graph import LinkedDirectedGraph
+from csrgraph import attach
+from resultcache import ResultCache
+from graphfile import load_graph, save_graph
+from edgereader import parse_token, load_edge_file
+from algorithms import shortest_path
+import cProfile
+from itertools import groupby
+from lzma import LZMAError
+import instrument
+from concurrent.futures import (ThreadPoolExecutor, ProcessPoolExecutor,
+                                as_completed)
+
+# The graph snapshot attached by each worker process of run_many
+_worker_block = None
+_worker_graph = None
+
+
+def _attach_worker(description):
+    """Attaches a worker process to the shared graph snapshot."""
+    global _worker_block, _worker_graph
+    _worker_block, _worker_graph = attach(description)
+
+
+def _run_in_worker(algorithm, start_label):
+    """Runs algorithm on the worker's snapshot from start_label."""
+    return algorithm(_worker_graph, start_label)
+
+
+def _is_vertex_token(token: tuple) -> bool:
+    """Returns True if a parsed token is a disconnected vertex."""
+    return token[1] is None
 
 
 class GraphDemoModel():
@@ -13,48 +44,46 @@ class GraphDemoModel():
     graph and run a graph-processing algorithm.
     """
 
-    def __init__(self):
+    def __init__(self, cache_size: int = 128, cache_bytes: int = None,
+                 flyweight: bool = False):
+        """Results of run are cached for up to cache_size runs and, if
+        cache_bytes is given, up to about that many bytes. If flyweight
+        is True, created graphs store edges as flyweights, which uses 
+        less memory per edge.
+        """
+        self._flyweight = flyweight
         self._graph = None
         self._start_label = None
+        self._load_errors = []
+        self._cache = ResultCache(cache_size, cache_bytes)
 
     def create_graph(self, rep: str, start_label: str) -> str:
         """Creates a graph from rep and start_label. Returns a message 
         if the graph was successfully created, or an error message 
         otherwise.
         """
-        self._graph = LinkedDirectedGraph()
+        self._graph = LinkedDirectedGraph(flyweight=self._flyweight)
         self._start_label = start_label
-        edge_list = rep.split()
-        for edge in edge_list:
-            # Disconnected vertex
-            if not '>' in edge:
-                # A disconnected vertex
-                if not self._graph.contains_vertex(edge):
-                    self._graph.add_vertex(edge)
-                else:
-                    self._graph = None
-                    return "Error: Duplicate vertex"
-            # Two vertices and an edge
-            else:
-                bracket_pos = edge.find('>')
-                colon_pos = edge.find(':')
-                if (bracket_pos == -1 or colon_pos == -1 or
-                    bracket_pos > colon_pos):
-                    self._graph = None
-                    return "Error: Problem with > or :"
-                from_label = edge[:bracket_pos]
-                to_label = edge[bracket_pos + 1 : colon_pos]
-                weight = edge[colon_pos + 1 :]
-                if weight.isdigit():
-                    weight = int(weight)
-                if not self._graph.contains_vertex(from_label):
-                    self._graph.add_vertex(from_label)
-                if not self._graph.contains_vertex(to_label):
-                    self._graph.add_vertex(to_label)
-                if self._graph.contains_edge(from_label, to_label):
-                    self._graph = None
-                    return "Error: Duplicate edge"
-                self._graph.add_edge(from_label, to_label, weight)
+        self._cache.clear()
+        tokens = map(parse_token, rep.split())
+        try:
+            # Runs of edges are added in one batch, and disconnected 
+            # vertices one at a time, keeping the order of the tokens
+            for is_vertex, run in groupby(tokens, _is_vertex_token):
+                if not is_vertex:
+                    self._graph.add_edges_from(run)
+                    continue
+                for label, to_label, weight in run:
+                    if self._graph.contains_vertex(label):
+                        self._graph = None
+                        return "Error: Duplicate vertex"
+                    self._graph.add_vertex(label)
+        except ValueError as error:
+            self._graph = None
+            return f"Error: {error}"
+        except KeyError:
+            self._graph = None
+            return "Error: Duplicate edge"
         vertex = self._graph.get_vertex(start_label)
         if vertex is None:
             self._graph = None
@@ -63,6 +92,69 @@ class GraphDemoModel():
             vertex.set_mark()
             return "Graph created successfully"
 
+    def load_edge_file(self, path: str, workers: int = 1) -> str:
+        """Creates a graph from the edge file at path, which may be 
+        compressed, streaming it in chunks. The last line of the file is
+        the start label. Lines with errors are skipped and can be 
+        retrieved with get_load_errors. Returns a message if the graph 
+        was created, or an error message otherwise.
+        """
+        self._graph = None
+        self._cache.clear()
+        try:
+            graph, self._start_label, self._load_errors = load_edge_file(
+                path, workers, flyweight=self._flyweight)
+        except (OSError, UnicodeDecodeError, LZMAError, EOFError):
+            # Missing files, text that is not UTF-8 and corrupt or 
+            # truncated compressed files
+            return "Error: Could not read the file"
+        if graph.get_vertex(self._start_label) is None:
+            return "Error: Start label not in graph"
+        self._graph = graph
+        if self._load_errors:
+            return (f"Graph created with {len(self._load_errors)} "
+                    "errors")
+        return "Graph created successfully"
+
+    def get_load_errors(self) -> list:
+        """Returns the (line_number, message) errors from the last 
+        call to load_edge_file.
+        """
+        return self._load_errors
+
+    def load_graph(self, path: str, start_label: str = None) -> str:
+        """Loads an immutable graph from the binary graph file at path.
+        If start_label is None, a start label must be passed to run.
+        Returns a message if the graph was successfully loaded, or an 
+        error message otherwise.
+        """
+        self._graph = None
+        self._start_label = start_label
+        self._cache.clear()
+        try:
+            graph = load_graph(path)
+        except (OSError, ValueError):
+            return "Error: Not a graph file"
+        if start_label is not None and not graph.contains_vertex(start_label):
+            return "Error: Start label not in graph"
+        self._graph = graph
+        return "Graph loaded successfully"
+
+    def save_graph(self, path: str) -> str:
+        """Saves the graph to a binary graph file at path. Returns a 
+        message if the graph was successfully saved, or an error message
+        otherwise.
+        """
+        if self._graph is None:
+            return "Error: No graph"
+        try:
+            save_graph(self._graph, path)
+        except ValueError as error:
+            return f"Error: {error}"
+        except OSError:
+            return "Error: Could not write the file"
+        return "Graph saved successfully"
+
     def get_graph(self):
         """Returns the string rep of the graph, 
         or None if it is unavailable.
@@ -72,15 +164,136 @@ class GraphDemoModel():
         else:
             return str(self._graph)
 
+    def get_graph_summary(self) -> str:
+        """Returns the numbers of vertices and edges in the graph, 
+        or None if it is unavailable.
+        """
+        if self._graph is None:
+            return None
+        return (f"{self._graph.size_vertices()} Vertices, "
+                f"{self._graph.size_edges()} Edges")
+
+    def iter_graph_lines(self, tokens_per_line: int = 1000):
+        """Returns an iterator over lines of up to tokens_per_line edges
+        of the graph in the src>dest:weight format, or None if the graph
+        is unavailable.
+        """
+        if self._graph is None:
+            return None
+        return self._graph.iter_lines(tokens_per_line)
+
     def get_start_label(self) -> str:
         """Returns the starting label."""
         return self._start_label
 
-    def run(self, algorithm):
-        """Runs the given algorithm on the graph and returns its result, 
-        or None if the graph is unavailable.
+    def contains_vertex(self, label) -> bool:
+        """Returns True if the graph is available and contains a vertex
+        with the given label, or False otherwise.
+        """
+        return self._graph is not None and self._graph.contains_vertex(label)
+
+    def get_cache_stats(self) -> dict:
+        """Returns the statistics of the result cache used by run."""
+        return self._cache.get_stats()
+
+    def run(self, algorithm, start_label: str = None):
+        """Runs the given algorithm on the graph from start_label, or 
+        from the graph's start label if it is None, and returns its 
+        result, or None if the graph is unavailable. Results are cached
+        until the graph changes, and a cached result is shared between 
+        calls, so callers must not modify it.
+        """
+        if self._graph is None:
+            return None
+        if start_label is None:
+            start_label = self._start_label
+        key = (algorithm, start_label, self._graph.get_version())
+        result = self._cache.get(key)
+        if result is None:
+            result = algorithm(self._graph, start_label)
+            self._cache.put(key, result)
+        return result
+
+    def find_path(self, target_label, start_label: str = None,
+                  heuristic=None):
+        """Returns a (path, cost) pair for a shortest path from 
+        start_label, or from the graph's start label if it is None, to
+        target_label, or None if the graph is unavailable. See 
+        algorithms.shortest_path for heuristic. Results are cached like
+        those of run.
+        """
+        if self._graph is None:
+            return None
+        if start_label is None:
+            start_label = self._start_label
+        key = (shortest_path, start_label, target_label, heuristic,
+               self._graph.get_version())
+        result = self._cache.get(key)
+        if result is None:
+            result = shortest_path(self._graph, start_label, target_label,
+                                   heuristic)
+            self._cache.put(key, result)
+        return result
+
+    def run_with_stats(self, algorithm, start_label: str = None,
+                       profile_path: str = None):
+        """Runs the given algorithm like run, but always computes the 
+        result and counts its work. Returns a (result, stats) pair, 
+        where stats is an instrument.RunStats, or None if the graph is 
+        unavailable. If profile_path is given, the run is also profiled
+        with cProfile and the profile is written to that file.
+        """
+        if self._graph is None:
+            return None
+        if start_label is None:
+            start_label = self._start_label
+        profiler = cProfile.Profile() if profile_path else None
+        stats = instrument.start()
+        try:
+            if profiler is not None:
+                result = profiler.runcall(algorithm, self._graph, start_label)
+            else:
+                result = algorithm(self._graph, start_label)
+        finally:
+            instrument.stop()
+        if profiler is not None:
+            profiler.dump_stats(profile_path)
+        return result, stats
+
+    def run_many(self, algorithm, start_labels, workers: int = None,
+                 processes: bool = False):
+        """Runs the given algorithm once for each start label on an 
+        immutable snapshot of the graph, using a pool of workers. 
+        Returns an iterator that yields (start_label, result) pairs as 
+        the runs complete, or None if the graph is unavailable. A thread
+        pool is used by default; if processes is True, a process pool 
+        is used instead and the snapshot is shared through shared 
+        memory.
         """
         if self._graph is None:
             return None
         else:
-            return algorithm(self._graph, self._start_label)
\ No newline at end of file
+            return self._run_many(algorithm, list(start_labels), workers,
+                                  processes)
+
+    def _run_many(self, algorithm, start_labels, workers, processes):
+        """Generates the results of run_many."""
+        snapshot = self._graph.freeze()
+        if not processes:
+            with ThreadPoolExecutor(workers) as executor:
+                futures = {executor.submit(algorithm, snapshot, label): label
+                           for label in start_labels}
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+            return
+        block, description = snapshot.share()
+        try:
+            with ProcessPoolExecutor(workers, initializer=_attach_worker,
+                                     initargs=(description,)) as executor:
+                futures = {executor.submit(_run_in_worker, algorithm, label): 
+                           label for label in start_labels}
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+        finally:
+            block.close()
+            block.unlink()
\ No newline at end of file
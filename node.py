@@ -7,6 +7,8 @@ This module defines a Node class.
 class Node():
     """Represents a singly linked node."""
 
+    __slots__ = ("data", "next")
+
     def __init__(self, data, next: 'Node' = None):
         self.data = data
         self.next = next
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""
+File: pathmatrix.py
+
+This module defines a PathMatrices class that stores the all-pairs
+distance and parent matrices of a graph in shared memory, in a
+memory-mapped file or in the memory of the process.
+"""
+
+import mmap
+from array import array
+from multiprocessing.shared_memory import SharedMemory
+
+INF = float("inf")
+
+
+class PathMatrices():
+    """Holds an N x N matrix of float64 distances followed by an N x N
+    matrix of int64 parents, where N is the number of vertices. Row i
+    describes the paths from vertex id i. Unreachable vertices have an
+    infinite distance, and a parent of -1 means there is no parent.
+    The matrices live in a shared memory block, or in the file at path
+    if one is given, so that other processes can fill in rows. If 
+    shared is False and there is no path, they live in the memory of 
+    the process instead and cannot be shared.
+
+    Call close when done with the matrices, or use them in a with 
+    statement, to free the shared memory block. A block that is not 
+    freed outlives the process and is reported as leaked.
+    """
+
+    def __init__(self, labels, path: str = None, description=None,
+                 shared: bool = True):
+        """Creates new matrices for the vertices with the given labels,
+        with every distance infinite and every parent -1. If
+        description is given, attaches to the matrices it describes
+        instead.
+        """
+        self._labels = tuple(labels)
+        self._ids = {label: i for i, label in enumerate(self._labels)}
+        n = len(self._labels)
+        size = max(1, 16 * n * n)
+        self._owner = description is None
+        self._block = None
+        self._file = None
+        self._map = None
+        if description is not None:
+            kind, name = description
+            if kind == "file":
+                path = name
+            else:
+                self._block = SharedMemory(name=name)
+        elif path is None and shared:
+            self._block = SharedMemory(create=True, size=size)
+        if self._block is not None:
+            buffer = self._block.buf
+        elif path is None:
+            buffer = memoryview(bytearray(size))
+        else:
+            self._file = open(path, "r+b" if description else "w+b")
+            if self._owner:
+                self._file.truncate(size)
+            self._map = mmap.mmap(self._file.fileno(), size)
+            buffer = memoryview(self._map)
+        self._buffer = buffer
+        self._distances = buffer[:8 * n * n].cast('d')
+        self._parents = buffer[8 * n * n:16 * n * n].cast('q')
+        if self._owner:
+            for row in range(n):
+                self.set_row(row, [INF] * n, [-1] * n)
+
+    def __enter__(self) -> 'PathMatrices':
+        """Returns the matrices for use in a with statement."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Closes the matrices at the end of a with statement."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Returns the number of vertices."""
+        return len(self._labels)
+
+    def describe(self):
+        """Returns a picklable description that another process can
+        pass to PathMatrices, along with the labels, to attach. Raises
+        ValueError if the matrices are in the memory of the process.
+        """
+        if self._block is not None:
+            return ("shared", self._block.name)
+        elif self._file is not None:
+            return ("file", self._file.name)
+        else:
+            raise ValueError("Matrices in process memory cannot be shared")
+
+    def get_labels(self) -> tuple:
+        """Returns the vertex labels in id order."""
+        return self._labels
+
+    def set_row(self, row: int, distances, parents):
+        """Stores the distances and parents of the paths from the
+        vertex with id row.
+        """
+        n = len(self)
+        self._distances[row * n:(row + 1) * n] = array('d', distances)
+        self._parents[row * n:(row + 1) * n] = array('q', parents)
+
+    def get_row(self, row: int):
+        """Returns (distances, parents) lists for the vertex with id
+        row.
+        """
+        n = len(self)
+        return (self._distances[row * n:(row + 1) * n].tolist(),
+                self._parents[row * n:(row + 1) * n].tolist())
+
+    def get_distance(self, from_label, to_label) -> float:
+        """Returns the length of the shortest path between the vertices
+        with the given labels, or inf if there is none.
+        """
+        n = len(self)
+        return self._distances[self._ids[from_label] * n +
+                               self._ids[to_label]]
+
+    def get_parent(self, from_label, to_label):
+        """Returns the label of the vertex before to_label on the
+        shortest path from from_label, or None if there is none.
+        """
+        n = len(self)
+        parent = self._parents[self._ids[from_label] * n +
+                               self._ids[to_label]]
+        return None if parent == -1 else self._labels[parent]
+
+    def flush(self):
+        """Writes changes to a memory-mapped file to disk."""
+        if self._map is not None:
+            self._map.flush()
+
+    def close(self):
+        """Releases the matrices. The owner of a shared memory block
+        also frees it; a file is left on disk. Closing the matrices 
+        again does nothing.
+        """
+        if self._buffer is None:
+            return
+        self._distances.release()
+        self._parents.release()
+        self._buffer.release()
+        self._buffer = None
+        if self._block is not None:
+            self._block.close()
+            if self._owner:
+                self._block.unlink()
+        elif self._map is not None:
+            self._map.close()
+            self._file.close()
@@ -0,0 +1,98 @@
+"""
+File: resultcache.py
+
+This module defines a ResultCache class, a bounded least-recently-used
+cache for the results of graph-processing algorithms.
+"""
+
+import sys
+from collections import OrderedDict
+
+# Rough size in bytes of one item in a collection other than a list or
+# tuple, such as a node of a LinkedStack
+ITEM_SIZE = 64
+
+
+def estimate_size(value) -> int:
+    """Returns a rough estimate of the number of bytes used by value.
+    Lists and tuples are measured item by item, other sized collections
+    are charged ITEM_SIZE per item, and other objects are measured
+    without following their references.
+    """
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(map(estimate_size, value))
+    elif not isinstance(value, str) and hasattr(value, "__len__"):
+        return sys.getsizeof(value) + ITEM_SIZE * len(value)
+    else:
+        return sys.getsizeof(value)
+
+
+class ResultCache():
+    """A least-recently-used cache bounded by a number of entries and,
+    optionally, by an estimated number of bytes. Keeps hit, miss and
+    eviction counts.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = None):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        """Returns the number of cached results."""
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        """Returns True if a result is cached for key, or False
+        otherwise. Does not count as a hit or a miss.
+        """
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """Returns the result cached for key and marks it as recently
+        used, or returns default if there is none.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return default
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value):
+        """Caches value for key, evicting the least recently used
+        results to stay within the limits. A value larger than the
+        byte budget is not cached.
+        """
+        size = estimate_size(value)
+        if self._max_bytes is not None and size > self._max_bytes:
+            return
+        old_entry = self._entries.pop(key, None)
+        if old_entry is not None:
+            self._bytes -= old_entry[1]
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while (len(self._entries) > self._max_entries or
+               (self._max_bytes is not None and
+                self._bytes > self._max_bytes)):
+            key, (value, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self._evictions += 1
+
+    def clear(self):
+        """Removes all cached results. The statistics are kept."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def get_stats(self) -> dict:
+        """Returns a dictionary with the hit, miss and eviction counts,
+        the number of entries and the estimated bytes in use.
+        """
+        return {"hits": self._hits, "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(self._entries), "bytes": self._bytes}
@@ -0,0 +1,147 @@
+"""
+File: test_dynamicpaths.py
+
+Tests for the DynamicShortestPaths class. Run from the repository root
+with python -m unittest discover tests.
+"""
+
+import random
+import unittest
+from algorithms import INFINITY, NegativeWeightError, shortest_paths
+from dynamicpaths import DynamicShortestPaths
+from graph import LinkedDirectedGraph
+
+
+def bellman_ford(graph, start_label) -> dict:
+    """Returns a dictionary of the distances from the vertex with
+    start_label, with INFINITY for unreachable vertices.
+    """
+    distances = {vertex.get_label(): INFINITY
+                 for vertex in graph.get_vertices()}
+    distances[start_label] = 0
+    for i in range(graph.size_vertices()):
+        for edge in graph.edges():
+            from_label = edge._src.get_label()
+            to_label = edge.get_to_vertex().get_label()
+            if distances[from_label] == INFINITY:
+                continue
+            distance = distances[from_label] + edge.get_weight()
+            if (distances[to_label] == INFINITY or
+                    distance < distances[to_label]):
+                distances[to_label] = distance
+    return distances
+
+
+def make_graph(rep: str, flyweight: bool = False) -> LinkedDirectedGraph:
+    """Returns a graph with the edges in rep, in the format
+    from>to:weight.
+    """
+    graph = LinkedDirectedGraph(flyweight=flyweight)
+    for token in rep.split():
+        from_label, rest = token.split(">")
+        to_label, weight = rest.split(":")
+        graph.add_edges_from([(from_label, to_label, int(weight))])
+    return graph
+
+
+class DynamicShortestPathsTest(unittest.TestCase):
+
+    def assert_matches(self, graph, paths, start_label):
+        """Checks every distance of paths against Bellman-Ford."""
+        expected = bellman_ford(graph, start_label)
+        for label, distance, parent in paths.get_results():
+            self.assertEqual(distance, expected[label], label)
+
+    def test_random_changes(self):
+        """Random non-negative changes keep the distances exact."""
+        rng = random.Random(9)
+        for flyweight in (False, True):
+            labels = [str(i) for i in range(12)]
+            graph = LinkedDirectedGraph(labels, flyweight=flyweight)
+            paths = DynamicShortestPaths(graph, "0")
+            for step in range(300):
+                from_label, to_label = rng.sample(labels, 2)
+                edge = graph.get_edge(from_label, to_label)
+                if edge is None:
+                    graph.add_edge(from_label, to_label, rng.randint(0, 9))
+                elif rng.random() < 0.3:
+                    graph.remove_edge(from_label, to_label)
+                else:
+                    edge.set_weight(rng.randint(0, 9))
+                self.assert_matches(graph, paths, "0")
+
+    def test_negative_weight_raises(self):
+        """A negative weight makes queries raise instead of looping or
+        going wrong.
+        """
+        graph = make_graph("A>B:1 B>A:1")
+        paths = DynamicShortestPaths(graph, "A")
+        graph.get_edge("B", "A").set_weight(-5)
+        with self.assertRaises(NegativeWeightError):
+            paths.get_distance("B")
+        with self.assertRaises(NegativeWeightError):
+            paths.get_results()
+
+    def test_negative_edge_raises(self):
+        """Adding a negative edge makes queries raise."""
+        graph = make_graph("A>B:5 A>C:1")
+        paths = DynamicShortestPaths(graph, "A")
+        graph.add_edge("B", "C", -10)
+        with self.assertRaises(NegativeWeightError):
+            paths.get_distance("C")
+
+    def test_negative_weight_reaches_every_listener(self):
+        """Every object following the graph hears of a negative weight."""
+        graph = make_graph("A>B:1 A>C:1")
+        first = DynamicShortestPaths(graph, "A")
+        second = DynamicShortestPaths(graph, "A")
+        graph.get_edge("A", "C").set_weight(-3)
+        for paths in (first, second):
+            with self.assertRaises(NegativeWeightError):
+                paths.get_distance("C")
+
+    def test_negative_graph_rejected(self):
+        """A graph with a negative weight cannot be followed."""
+        graph = make_graph("A>B:1 C>D:-1")
+        with self.assertRaises(NegativeWeightError):
+            DynamicShortestPaths(graph, "A")
+
+    def test_flyweight_edge_objects(self):
+        """Two edge objects for one flyweight edge report the right
+        old weights.
+        """
+        graph = make_graph("A>C:1 A>B:3 B>C:1", flyweight=True)
+        paths = DynamicShortestPaths(graph, "A")
+        first = graph.get_edge("A", "C")
+        second = graph.get_edge("A", "C")
+        first.set_weight(10)
+        second.set_weight(2)
+        self.assertEqual(paths.get_distance("C"), 2)
+        self.assert_matches(graph, paths, "A")
+
+    def test_removed_edge_objects(self):
+        """Setting the weight of a removed edge leaves the paths alone."""
+        for flyweight in (False, True):
+            graph = make_graph("A>B:5 B>C:1 C>D:1", flyweight=flyweight)
+            paths = DynamicShortestPaths(graph, "A")
+            edge = graph.get_edge("A", "B")
+            later = graph.get_edge("C", "D")
+            graph.remove_edge("A", "B")
+            graph.remove_vertex("C")
+            edge.set_weight(1)
+            later.set_weight(0)
+            self.assertFalse(graph.contains_edge("A", "B"))
+            self.assertEqual(graph.size_edges(), 0)
+            self.assert_matches(graph, paths, "A")
+
+    def test_seeded_results(self):
+        """Paths seeded from shortest_paths follow later changes."""
+        graph = make_graph("A>B:4 A>C:1 C>B:1")
+        paths = DynamicShortestPaths(graph, "A", shortest_paths(graph, "A"))
+        self.assertEqual(paths.get_distance("B"), 2)
+        graph.get_edge("C", "B").set_weight(7)
+        self.assertEqual(paths.get_distance("B"), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,8 +4,19 @@ File: view.py
 This module defines a GraphDemoView class for viewing the application.
 """
 
+import argparse
+import sys
 from model import GraphDemoModel
-from algorithms import shortest_paths, span_tree, topo_sort
+from batch import load_model, run_batch
+from algorithms import (shortest_paths, span_tree, topo_sort, CycleError,
+                        NegativeWeightError)
+from graphfile import is_graph_file
+from itertools import islice
+
+# The number of edges printed per line, and lines per page, when viewing
+# the graph
+TOKENS_PER_LINE = 8
+PAGE_LINES = 20
 
 
 class GraphDemoView():
@@ -23,24 +34,38 @@ class GraphDemoView():
                 "  2  Input a graph from a file\n"
                 "  3  View the current graph\n"
                 "  4  Single source shortest paths\n"
-                "  5  Minimum spanning tree\n"
-                "  6  Topological sort\n"
-                "  7  Exit the program\n")
+                "  5  Shortest path to a target\n"
+                "  6  Minimum spanning tree\n"
+                "  7  Topological sort\n"
+                "  8  Save the graph to a binary file\n"
+                "  9  Exit the program\n")
 
         while True:
-            command = self._get_command(7, menu)
+            command = self._get_command(9, menu)
             if command == 1: self._get_from_keyboard()
             elif command == 2: self._get_from_file()
-            elif command == 3: 
-                print(self._model.get_graph())
+            elif command == 3: self._view_graph()
             elif command == 4:
-                print("Paths:")
-                for row in self._model.run(shortest_paths):
-                    print(row)
-            elif command == 5:
-                print(f"Tree: {' '.join(map(str, self._model.run(span_tree)))}")
+                try:
+                    paths = self._model.run(shortest_paths)
+                except NegativeWeightError as error:
+                    print(f"Error: {error}")
+                else:
+                    print("Paths:")
+                    for row in paths:
+                        print(row)
+            elif command == 5: self._find_path()
             elif command == 6:
-                print(f"Sort: {' '.join(map(str, self._model.run(topo_sort)))}")
+                print(f"Tree: {' '.join(map(str, self._model.run(span_tree)))}")
+            elif command == 7:
+                try:
+                    stack = self._model.run(topo_sort)
+                except CycleError as error:
+                    print(f"Error: {error}")
+                else:
+                    order = reversed(stack)
+                    print(f"Sort: {' '.join(map(str, order))}")
+            elif command == 8: self._save_to_file()
             else: break
 
     def _get_command(self, high: int, menu: str) -> int:
@@ -76,14 +101,92 @@ class GraphDemoView():
             file_name = input("Enter the file name or return to quit: ")
             if file_name == "": break
             try:
-                with open(file_name) as topo:
-                    rep = topo.readline()
-                    start_label = topo.readline()
-                    print(self._model.create_graph(rep, start_label))
+                if is_graph_file(file_name):
+                    start_label = input("Enter the start label: ")
+                    print(self._model.load_graph(file_name, start_label))
                     break
+                print(self._model.load_edge_file(file_name))
+                for number, message in self._model.get_load_errors()[:10]:
+                    print(f"Line {number}: {message}")
+                break
             except:
                 print("Incorrect file name or path")
 
-        
-# Start up the application
-GraphDemoView().run()
\ No newline at end of file
+    def _view_graph(self):
+        """Prints the vertex and edge counts of the graph and then its 
+        edges a page at a time, so that a large graph is never turned 
+        into one string.
+        """
+        summary = self._model.get_graph_summary()
+        print(summary)
+        if summary is None:
+            return
+        lines = self._model.iter_graph_lines(TOKENS_PER_LINE)
+        while True:
+            page = list(islice(lines, PAGE_LINES))
+            for line in page:
+                print(line)
+            if len(page) < PAGE_LINES:
+                break
+            more = input("Press return for more, or enter q to stop: ")
+            if more.strip().lower() == "q":
+                break
+
+    def _find_path(self):
+        """Inputs a target label and prints a shortest path to it from
+        the start label.
+        """
+        target_label = input("Enter the target label: ")
+        if not self._model.contains_vertex(target_label):
+            print("Error: Target label not in graph")
+            return
+        try:
+            path, cost = self._model.find_path(target_label)
+        except NegativeWeightError as error:
+            print(f"Error: {error}")
+            return
+        if not path:
+            print(f"No path to {target_label}")
+        else:
+            print(f"Path: {' '.join(map(str, path))}")
+            print(f"Cost: {cost}")
+
+    def _save_to_file(self):
+        """Saves the graph to a binary graph file, which option 2 can
+        load quickly.
+        """
+        file_name = input("Enter the file name or return to quit: ")
+        if file_name != "":
+            print(self._model.save_graph(file_name))
+
+
+def main(argv: list = None):
+    """Runs the menu-driven app, or runs a batch of queries if a graph 
+    file and a query file are given.
+    """
+    parser = argparse.ArgumentParser(
+        description="Run graph-processing algorithms on a graph.")
+    parser.add_argument("graph", nargs="?",
+                        help="edge file or binary graph file for batch mode")
+    parser.add_argument("queries", nargs="?",
+                        help="file of JSON-line queries, or - for stdin")
+    parser.add_argument("--start", help="default start label for queries")
+    args = parser.parse_args(argv)
+    if args.graph is None:
+        GraphDemoView().run()
+        return
+    if args.queries is None:
+        parser.error("a query file is required in batch mode")
+    model, message = load_model(args.graph)
+    print(message, file=sys.stderr)
+    if message.startswith("Error"):
+        sys.exit(1)
+    if args.queries == "-":
+        run_batch(model, sys.stdin, sys.stdout, args.start)
+    else:
+        with open(args.queries) as queries:
+            run_batch(model, queries, sys.stdout, args.start)
+
+
+if __name__ == "__main__":
+    main()